@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import aiohttp
 import pandas as pd
 import os
 import time
@@ -9,6 +10,11 @@ from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
 import concurrent.futures
+from email.utils import parsedate_to_datetime
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
+from tenacity.wait import wait_base
+from aiolimiter import AsyncLimiter
+from selectolax.lexbor import LexborHTMLParser
 
 # Настройка логирования
 logging.basicConfig(
@@ -344,9 +350,186 @@ class DataManager:
         except Exception as e:
             logger.error(f"Ошибка при сохранении кэша: {e}")
 
+def load_api_keys_from_env(env_prefix: str) -> List[str]:
+    """
+    Загружает API ключи из переменных окружения за один проход по окружению: основной ключ
+    (например, CHECKO_TOKEN) и дополнительные ключи с номерами (CHECKO_TOKEN_1, CHECKO_TOKEN_2 и т.д.)
+    
+    :param env_prefix: Префикс для переменных окружения (например, 'CHECKO_TOKEN')
+    :return: Список найденных ключей: основной, затем дополнительные по возрастанию номера
+    """
+    env = os.environ
+    main_key = env.get(env_prefix)
+    
+    numbered = []
+    name_prefix = env_prefix + "_"
+    prefix_len = len(name_prefix)
+    for name, value in env.items():
+        if value and name.startswith(name_prefix) and name[prefix_len:].isdigit():
+            numbered.append((int(name[prefix_len:]), value))
+    numbered.sort()
+    
+    return ([main_key] if main_key else []) + [value for _, value in numbered]
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает значение заголовка Retry-After (число секунд или HTTP-дата)
+    
+    :param value: Значение заголовка
+    :return: Время ожидания в секундах или None, если заголовок отсутствует или некорректен
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class wait_retry_after(wait_base):
+    """
+    Стратегия ожидания для tenacity: учитывает заголовок Retry-After из ответа сервера,
+    а при его отсутствии использует запасную стратегию (экспоненциальную задержку с джиттером)
+    """
+    
+    def __init__(self, fallback: wait_base, max_wait: float = 120.0):
+        self.fallback = fallback
+        self.max_wait = max_wait
+    
+    def __call__(self, retry_state) -> float:
+        delay = self.fallback(retry_state)
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        headers = getattr(exception, 'headers', None)
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+        if retry_after is not None:
+            return min(self.max_wait, max(retry_after, delay))
+        return delay
+
+
+class HttpStatusError(Exception):
+    """Неуспешный статус HTTP-ответа"""
+    
+    def __init__(self, status: int, url: str = "", headers=None):
+        self.status = status
+        self.url = url
+        # Заголовки ответа (используются, например, для учета Retry-After)
+        self.headers = headers or {}
+        super().__init__(f"HTTP {status} {url}".strip())
+
+
+class TransientHttpError(HttpStatusError):
+    """Временная ошибка сервера (429, 5xx) - запрос имеет смысл повторить"""
+
+
+class PermanentHttpError(HttpStatusError):
+    """Ошибка, которую повтор запроса не исправит (4xx, кроме 429)"""
+
+
+def raise_for_http_status(response: aiohttp.ClientResponse) -> None:
+    """
+    Выбрасывает типизированное исключение для неуспешного статуса ответа
+    (200 и 304 считаются успешными)
+    
+    :param response: Ответ сервера
+    :raises TransientHttpError: Для статусов 429 и 5xx
+    :raises PermanentHttpError: Для остальных статусов 4xx и неожиданных статусов
+    """
+    status = response.status
+    if status in (200, 304):
+        return
+    if status == 429 or status >= 500:
+        raise TransientHttpError(status, str(response.url), response.headers)
+    raise PermanentHttpError(status, str(response.url), response.headers)
+
+
+async def read_html_until(response: aiohttp.ClientResponse, marker: bytes, chunk_size: int = 16384) -> str:
+    """
+    Читает HTML-страницу по частям и прекращает загрузку, как только получен
+    открывающий тег с указанным маркером (например, классом искомой ссылки).
+    Если маркер не встретился, страница читается целиком.
+    
+    :param response: Ответ сервера
+    :param marker: Байтовая строка, по которой определяется искомый тег
+    :param chunk_size: Размер читаемой части в байтах
+    :return: Прочитанная часть страницы
+    """
+    buffer = bytearray()
+    found_at = -1
+    async for chunk in response.content.iter_chunked(chunk_size):
+        # Маркер может оказаться на границе частей - ищем с небольшим перекрытием
+        search_from = max(0, len(buffer) - len(marker) + 1)
+        buffer += chunk
+        if found_at < 0:
+            found_at = buffer.find(marker, search_from)
+        # Тег с маркером получен полностью (вместе с атрибутами) - остаток страницы не нужен
+        if found_at >= 0 and buffer.find(b'>', found_at) >= 0:
+            break
+    return buffer.decode(response.charset or 'utf-8', errors='replace')
+
+
+class ResolvedSet:
+    """
+    Общий для парсеров набор ИНН компаний, руководитель которых уже найден.
+    Позволяет не выполнять сетевые запросы для компании, уже обработанной другим парсером.
+    
+    Набор общий только в пределах одного процесса: при запуске через ProcessPoolExecutor
+    каждый рабочий процесс получает свою копию (вместе с парсером), и результаты других
+    процессов в ней не видны. Между запусками дубликаты отсекаются кэшем результатов
+    DataManager и дисковым кэшем парсеров
+    """
+    
+    # Значения ФИО руководителя, которые не считаются найденными данными
+    UNRESOLVED = frozenset({None, "", "не найдено", "лимит API исчерпан"})
+    
+    def __init__(self):
+        # ИНН компании -> (ФИО руководителя, ИНН руководителя)
+        self._results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    
+    def __contains__(self, inn: str) -> bool:
+        return inn in self._results
+    
+    def __len__(self) -> int:
+        return len(self._results)
+    
+    def get(self, inn: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Возвращает найденные данные руководителя компании
+        
+        :param inn: ИНН компании
+        :return: Пара (ФИО руководителя, ИНН руководителя) или None
+        """
+        return self._results.get(inn)
+    
+    def add(self, company: CompanyData) -> bool:
+        """
+        Добавляет компанию, если ее руководитель найден
+        
+        :param company: Данные компании
+        :return: True, если компания добавлена
+        """
+        if company.inn is None or company.chairman_name in self.UNRESOLVED:
+            return False
+        self._results[company.inn] = (company.chairman_name, company.chairman_inn)
+        return True
+
+
 class BaseSiteParser:
     """Базовый класс для парсеров различных сайтов"""
     
+    # Префикс переменных окружения парсера (например, {env_prefix}_CONCURRENCY)
+    env_prefix = "PARSER"
+    # Число одновременных запросов к сайту по умолчанию
+    default_concurrency = 10
+    # Общий лимит пула соединений HTTP-сессии
+    connection_limit = 20
+    # Версия формата результатов в дисковом кэше: при ее изменении старые записи не используются
+    result_schema_version = 1
+    
     def __init__(self, site_name: str, rate_limit: float = 1.0):
         self.site_name = site_name
         self.rate_limit = rate_limit  # Задержка между запросами в секундах
@@ -354,6 +537,363 @@ class BaseSiteParser:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
+        # Ограничение числа одновременных запросов к сайту
+        self.concurrency = int(os.getenv(f"{self.env_prefix}_CONCURRENCY", str(self.default_concurrency)))
+        self._sem = asyncio.BoundedSemaphore(self.concurrency)
+        # Ограничение частоты запросов: не чаще одного запроса за rate_limit секунд.
+        # В отличие от фиксированной паузы, ожидание не нужно, если предыдущий запрос сам длился дольше
+        self._rl = AsyncLimiter(max_rate=1, time_period=max(self.rate_limit, 0.001))
+        
+        # Кэш результатов по ИНН: (ФИО руководителя, ИНН руководителя) и найденные URL страниц компаний.
+        # Дополнительно результаты сохраняются на диск (diskcache), если библиотека установлена
+        self._result_cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._url_cache: Dict[str, str] = {}
+        self._disk_cache = None
+        self.cache_dir = os.getenv('PARSER_CACHE_DIR', '.parser_cache')
+        self.cache_ttl = int(os.getenv('PARSER_CACHE_TTL', str(7 * 24 * 3600)))
+        # Общая HTTP-сессия (создается лениво, в том цикле событий, где выполняется парсинг)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Менеджер данных для сохранения результатов и общий для парсеров набор найденных ИНН
+        # (передаются ParserManager при регистрации парсера)
+        self._data_manager: Optional[DataManager] = None
+        self._resolved: Optional[ResolvedSet] = None
+        
+        # Есть ли данные руководителя прямо в выдаче поиска сайта (см. _parse_company_via_search):
+        # None - еще не известно, решение принимается по первой выдаче со ссылкой на компанию
+        self._inline_director: Optional[bool] = None
+    
+    def set_data_manager(self, data_manager: Optional[DataManager]) -> None:
+        """
+        Задает менеджер данных, в который парсер сохраняет результаты по мере их получения
+        
+        :param data_manager: Экземпляр DataManager
+        """
+        self._data_manager = data_manager
+    
+    def _get_data_manager(self) -> Optional[DataManager]:
+        """Возвращает менеджер данных для обновления результатов или None, если он не задан"""
+        return self._data_manager
+    
+    def set_resolved_set(self, resolved: Optional[ResolvedSet]) -> None:
+        """
+        Задает общий для парсеров набор ИНН, руководитель которых уже найден.
+        Набор копируется в процесс вместе с парсером, поэтому изменения в рабочем процессе
+        ProcessPoolExecutor не видны другим процессам (см. ResolvedSet)
+        
+        :param resolved: Экземпляр ResolvedSet
+        """
+        self._resolved = resolved
+    
+    def _load_api_keys_from_env(self, env_prefix: str) -> List[str]:
+        """
+        Загружает API ключи из переменных окружения с указанным префиксом (см. load_api_keys_from_env)
+        
+        :param env_prefix: Префикс для переменных окружения (например, 'CHECKO_TOKEN')
+        :return: Список найденных ключей
+        """
+        keys = load_api_keys_from_env(env_prefix)
+        self.logger.info(f"Загружено {len(keys)} ключей с префиксом {env_prefix}")
+        return keys
+    
+    def _get_disk_cache(self):
+        """
+        Возвращает дисковый кэш, открывая его при первом обращении
+        
+        :return: Экземпляр diskcache.Cache или None, если diskcache не установлен
+        """
+        if self._disk_cache is None:
+            try:
+                import diskcache
+                self._disk_cache = diskcache.Cache(self.cache_dir)
+            except ImportError:
+                self.logger.debug("diskcache не установлен, результаты кэшируются только в памяти")
+                self._disk_cache = False
+        return self._disk_cache or None
+    
+    def _cache_get(self, key: str):
+        """Читает значение из дискового кэша парсера"""
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return None
+        return disk_cache.get(f"{self.site_name}:{key}")
+    
+    def _cache_set(self, key: str, value, expire: Optional[float] = None) -> None:
+        """Записывает значение в дисковый кэш парсера"""
+        disk_cache = self._get_disk_cache()
+        if disk_cache is not None:
+            disk_cache.set(f"{self.site_name}:{key}", value, expire=expire)
+    
+    def _get_cached_result(self, inn: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Возвращает сохраненный результат для ИНН компании
+        
+        :param inn: ИНН компании
+        :return: Пара (ФИО руководителя, ИНН руководителя) или None
+        """
+        # Компания уже обработана другим парсером
+        if self._resolved is not None:
+            result = self._resolved.get(inn)
+            if result is not None:
+                return result
+        
+        result = self._result_cache.get(inn)
+        if result is None:
+            result = self._cache_get(f"result:{self.result_schema_version}:{inn}")
+            if result is not None:
+                self._result_cache[inn] = result
+        return result
+    
+    def _cache_result(self, company: CompanyData) -> None:
+        """
+        Сохраняет результат для компании в памяти и на диске (на cache_ttl секунд)
+        
+        :param company: Данные компании с заполненными полями руководителя
+        """
+        result = (company.chairman_name, company.chairman_inn)
+        self._result_cache[company.inn] = result
+        self._cache_set(f"result:{self.result_schema_version}:{company.inn}", result, expire=self.cache_ttl)
+        if self._resolved is not None:
+            self._resolved.add(company)
+    
+    def _get_cached_url(self, inn: str) -> Optional[str]:
+        """
+        Возвращает сохраненный URL страницы компании
+        
+        :param inn: ИНН компании
+        :return: URL или None
+        """
+        url = self._url_cache.get(inn)
+        if url is None:
+            url = self._cache_get(f"url:{inn}")
+            if url is not None:
+                self._url_cache[inn] = url
+        return url
+    
+    def _cache_url(self, inn: str, url: str) -> None:
+        """
+        Сохраняет URL страницы компании (без ограничения срока)
+        
+        :param inn: ИНН компании
+        :param url: URL страницы компании
+        """
+        self._url_cache[inn] = url
+        self._cache_set(f"url:{inn}", url)
+    
+    def _get_page_validators(self, url: str) -> Tuple[Dict[str, str], Optional[Tuple[Optional[str], Optional[str]]]]:
+        """
+        Возвращает заголовки условного запроса (If-None-Match / If-Modified-Since)
+        для страницы и результат, извлеченный из нее при прошлом запросе
+        
+        :param url: URL страницы
+        :return: Пара (заголовки, сохраненный результат или None)
+        """
+        entry = self._cache_get(f"page:{url}")
+        if not entry:
+            return {}, None
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers, entry.get('result')
+    
+    def _store_page_validators(self, url: str, headers, company: CompanyData) -> None:
+        """
+        Сохраняет ETag / Last-Modified страницы вместе с извлеченным из нее результатом
+        
+        :param url: URL страницы
+        :param headers: Заголовки ответа сервера
+        :param company: Данные компании с заполненными полями руководителя
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if etag or last_modified:
+            self._cache_set(f"page:{url}", {
+                'etag': etag,
+                'last_modified': last_modified,
+                'result': (company.chairman_name, company.chairman_inn),
+            })
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает общую HTTP-сессию парсера, создавая её при первом обращении.
+        Сессия переиспользуется для всех компаний и повторных попыток.
+        
+        :return: Экземпляр aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    limit_per_host=self.concurrency,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _get_or_raise(self, session: aiohttp.ClientSession, url: str, *,
+                            params: Optional[Dict[str, str]] = None,
+                            headers: Optional[Dict[str, str]] = None,
+                            until: Optional[bytes] = None) -> Tuple[Optional[str], Any]:
+        """
+        Выполняет GET-запрос и возвращает текст страницы или выбрасывает типизированное исключение
+        
+        :param session: HTTP-сессия
+        :param url: URL страницы
+        :param params: Параметры запроса
+        :param headers: Дополнительные заголовки (к заголовкам парсера)
+        :param until: Маркер, после получения которого чтение страницы прекращается (см. read_html_until)
+        :return: Пара (текст страницы или None для ответа 304, заголовки ответа)
+        :raises TransientHttpError: Для статусов 429 и 5xx (повторяется в _retrying)
+        :raises PermanentHttpError: Для остальных ошибок 4xx
+        """
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        async with session.get(url, params=params, headers=request_headers) as response:
+            raise_for_http_status(response)
+            if response.status == 304:
+                return None, response.headers
+            if until is not None:
+                return await read_html_until(response, until), response.headers
+            return await response.text(), response.headers
+    
+    def _retrying(self, attempts: int = 3) -> AsyncRetrying:
+        """
+        Создает цикл повторных попыток для сетевых запросов: экспоненциальная задержка
+        с джиттером (1-8 секунд) с учетом заголовка Retry-After. Повторяются сетевые ошибки,
+        таймауты и временные ошибки сервера (TransientHttpError)
+        
+        :param attempts: Максимальное количество попыток
+        :return: Экземпляр AsyncRetrying (последнее исключение пробрасывается наружу)
+        """
+        return AsyncRetrying(
+            stop=stop_after_attempt(attempts),
+            wait=wait_retry_after(wait_exponential_jitter(initial=1, max=8)),
+            retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError, TransientHttpError)),
+            before_sleep=lambda retry_state: self.logger.warning(
+                f"Повторная попытка {retry_state.attempt_number + 1}/{attempts} после ошибки: "
+                f"{retry_state.outcome.exception()}"
+            ),
+            reraise=True
+        )
+    
+    def _extract_director(self, root, company: CompanyData) -> bool:
+        """
+        Извлекает данные руководителя со страницы компании или из выдачи поиска
+        Должен быть переопределен в подклассах, использующих _parse_company_via_search
+        """
+        raise NotImplementedError("Subclasses must implement _extract_director()")
+    
+    async def _parse_company_via_search(self, company: CompanyData, *, base_url: str,
+                                        link_selector: str, link_marker: bytes) -> Optional[CompanyData]:
+        """
+        Парсит информацию о председателе компании через поиск по ИНН на сайте (self.search_url)
+        и страницу компании. Данные руководителя извлекаются методом _extract_director
+        
+        :param company: Данные компании
+        :param base_url: Адрес сайта, к которому добавляется ссылка на страницу компании из выдачи
+        :param link_selector: CSS-селектор ссылки на страницу компании в выдаче поиска
+        :param link_marker: Фрагмент HTML ссылки на компанию, после которого чтение выдачи прекращается
+        :return: Данные компании или None, если получить данные не удалось
+        """
+        # Результат уже получен ранее (в этом или предыдущем запуске)
+        cached = self._get_cached_result(company.inn)
+        if cached is not None:
+            company.chairman_name, company.chairman_inn = cached
+            self.logger.info(f"Данные компании {company.inn} взяты из кэша")
+            return company
+
+        try:
+            # Сетевые ошибки, 429 и 5xx повторяются с экспоненциальной задержкой (с учетом Retry-After)
+            async for attempt in self._retrying():
+                with attempt:
+                    async with self._sem:
+                        session = await self._get_session()
+
+                        # URL страницы компании берем из кэша или находим через поиск по ИНН
+                        company_url = self._get_cached_url(company.inn)
+                        if company_url is None:
+                            # Если сайт показывает данные руководителя прямо в выдаче (или это еще не известно),
+                            # читаем выдачу целиком, иначе - только до ссылки на компанию
+                            inline = self._inline_director
+                            html, _ = await self._get_or_raise(
+                                session, self.search_url, params={'query': company.inn},
+                                until=None if inline is not False else link_marker
+                            )
+                            search_tree = LexborHTMLParser(html)
+
+                            # Ищем ссылку на страницу компании
+                            company_link = search_tree.css_first(link_selector)
+
+                            # Данные руководителя есть в выдаче - страницу компании не запрашиваем
+                            if inline is not False:
+                                found = self._extract_director(search_tree, company)
+                                # Пустая выдача или страница капчи не говорит о формате выдачи сайта
+                                if inline is None and company_link:
+                                    self._inline_director = found
+                                if found:
+                                    self.logger.info(f"Данные руководителя компании {company.inn} найдены в выдаче поиска")
+                                    self._cache_result(company)
+                                    return company
+
+                            if not company_link:
+                                self.logger.warning(f"Компания {company.inn} не найдена на {self.site_name}")
+                                return None
+
+                            company_href = company_link.attributes.get('href')
+                            if not company_href:
+                                return None
+
+                            company_url = f"{base_url}{company_href}"
+                            self._cache_url(company.inn, company_url)
+
+                        # Переходим на страницу компании (условным запросом, если страница уже загружалась)
+                        validators, page_result = self._get_page_validators(company_url)
+                        company_html, response_headers = await self._get_or_raise(session, company_url, headers=validators)
+                        if company_html is None:
+                            if page_result is None:
+                                self.logger.warning(f"Сервер вернул 304 без сохраненных данных для компании {company.inn}")
+                                return None
+                            self.logger.info(f"Страница компании {company.inn} не изменилась, используем сохраненные данные")
+                            company.chairman_name, company.chairman_inn = page_result
+                            self._cache_result(company)
+                            return company
+
+                        if not self._extract_director(company_html, company):
+                            self.logger.warning(f"Информация о руководителе компании {company.inn} не найдена")
+                            return None
+
+                        self._store_page_validators(company_url, response_headers, company)
+                        self._cache_result(company)
+                        return company
+        except PermanentHttpError as e:
+            self.logger.warning(f"Ошибка при получении данных компании {company.inn} на {self.site_name}: статус {e.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, TransientHttpError) as e:
+            self.logger.error(f"Ошибка сети при парсинге компании {company.inn} на {self.site_name}: {e}")
+        except Exception as e:
+            self.logger.error(f"Ошибка при парсинге компании {company.inn} на {self.site_name}: {e}")
+
+        return None
+    
+    async def close(self) -> None:
+        """
+        Закрывает общую HTTP-сессию и дисковый кэш, если они были созданы.
+        Вызывается менеджером парсеров после завершения обработки.
+        """
+        if self._session is not None:
+            try:
+                await self._session.close()
+            except Exception as e:
+                self.logger.error(f"Ошибка при закрытии HTTP-сессии: {e}")
+            finally:
+                self._session = None
+        
+        if self._disk_cache:
+            self._disk_cache.close()
+        self._disk_cache = None
     
     async def parse_company(self, company: CompanyData) -> Optional[CompanyData]:
         """
@@ -371,8 +911,8 @@ class BaseSiteParser:
             try:
                 self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
                 
-                # Соблюдаем задержку между запросами
-                await asyncio.sleep(self.rate_limit)
+                # Соблюдаем частоту запросов
+                await self._rl.acquire()
                 
                 # Парсим информацию о компании
                 result = await self.parse_company(company)
@@ -394,12 +934,16 @@ class ParserManager:
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
         self.parsers: List[BaseSiteParser] = []
+        # ИНН, руководитель которых уже найден каким-либо парсером
+        self.resolved = ResolvedSet()
         self.logger = logging.getLogger("TIN_Parser.Manager")
         self.batch_size = 50  # Размер пакета компаний для обработки
         self.max_workers = 3  # Максимальное количество параллельных процессов
     
     def add_parser(self, parser: BaseSiteParser) -> None:
         """Добавление парсера"""
+        parser.set_data_manager(self.data_manager)
+        parser.set_resolved_set(self.resolved)
         self.parsers.append(parser)
         self.logger.info(f"Добавлен парсер для сайта {parser.site_name}")
     
@@ -449,6 +993,12 @@ class ParserManager:
                 
         except Exception as e:
             self.logger.error(f"Ошибка при обработке пакета через {parser.__class__.__name__}: {e}")
+        finally:
+            # Освобождаем ресурсы парсера (HTTP-сессию и т.п.)
+            try:
+                await parser.close()
+            except Exception as e:
+                self.logger.error(f"Ошибка при закрытии парсера {parser.__class__.__name__}: {e}")
 
     def process_batch_sync(self, parser: BaseSiteParser, companies: List[CompanyData]) -> None:
         """
@@ -513,16 +1063,11 @@ class ParserManager:
                 checko_keys = []
                 if parser.__class__.__name__ == "CheckoParser" and hasattr(parser, "checko_keys"):
                     # Используем only_env=True для загрузки ключей только из переменных окружения
-                    checko_keys = [parser.checko_keys.get_current_key()]
+                    current_key = parser.checko_keys.get_current_key()
+                    checko_keys = [current_key] if current_key else []
                     
                     # Загружаем дополнительные ключи из переменных окружения
-                    i = 1
-                    while True:
-                        key = os.getenv(f"CHECKO_TOKEN_{i}")
-                        if not key:
-                            break
-                        checko_keys.append(key)
-                        i += 1
+                    checko_keys += [key for key in load_api_keys_from_env("CHECKO_TOKEN") if key not in checko_keys]
                     
                     if checko_keys:
                         self.logger.info(f"Найдено {len(checko_keys)} API ключей Checko")
@@ -555,6 +1100,8 @@ class ParserManager:
                                 module = importlib.import_module(parser.__class__.__module__)
                                 parser_class = getattr(module, parser.__class__.__name__)
                                 new_parser = parser_class(token=key)
+                                new_parser.set_data_manager(self.data_manager)
+                                new_parser.set_resolved_set(self.resolved)
                                 
                                 self.logger.info(f"Создаем задачу для ключа {key_index+1}/{len(checko_keys)} с {len(chunk)} компаниями")
                                 tasks.append(self.process_batch(new_parser, chunk))
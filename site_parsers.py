@@ -1,10 +1,14 @@
 import threading
+import itertools
+import functools
+from collections import Counter
 import aiohttp
 import asyncio
 import logging
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable, Set
+from concurrent.futures import ThreadPoolExecutor
 import os
 import signal
 import sys
@@ -19,9 +23,9 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
-from parser_base import BaseSiteParser, CompanyData, DataManager
+from parser_base import BaseSiteParser, CompanyData, DataManager, TransientHttpError, parse_retry_after
 # import undetected_chromedriver as uc
-from dadata import Dadata, DadataAsync
+import httpx
 
 from dotenv import load_dotenv, find_dotenv
 
@@ -33,18 +37,52 @@ if find_dotenv():
 # Настройка логирования
 logger = logging.getLogger("TIN_Parser.site_parsers")
 
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads_json(data) -> Any:
+    """
+    Разбирает JSON: через orjson, если он установлен, иначе стандартным json
+    
+    :param data: Тело ответа (bytes или str)
+    :return: Разобранные данные
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson строже стандартного json (например, к NaN и очень большим числам)
+            pass
+    return json.loads(data)
+
+
+def _enable_orjson_for_selenium() -> None:
+    """
+    Подменяет разбор JSON-ответов WebDriver (включая ответы CDP-команд) на orjson.
+    Включается переменной окружения KONTUR_ORJSON=1; без установленного orjson
+    остается стандартный json.
+    """
+    if orjson is None:
+        logger.warning("KONTUR_ORJSON=1, но orjson не установлен, используется стандартный json")
+        return
+    
+    from selenium.webdriver.remote import remote_connection
+    remote_connection.utils.load_json = _loads_json
+    logger.info("Разбор ответов WebDriver переключен на orjson")
+
+
+if os.getenv('KONTUR_ORJSON', '0') == '1':
+    _enable_orjson_for_selenium()
+
 # Загрузка конфигурационных параметров из .env
-RAIFFEISEN_BLOCK_TIME_SECONDS = int(os.getenv('RAIFFEISEN_BLOCK_TIME_SECONDS', '3600'))
-RAIFFEISEN_SECONDARY_WAIT_SECONDS = int(os.getenv('RAIFFEISEN_SECONDARY_WAIT_SECONDS', '600'))
+RAIFFEISEN_BURST = int(os.getenv('RAIFFEISEN_BURST', '5'))
+RAIFFEISEN_REFILL_SECONDS = float(os.getenv('RAIFFEISEN_REFILL_SEC', '60'))
 RAIFFEISEN_MAX_RETRY_ATTEMPTS = int(os.getenv('RAIFFEISEN_MAX_RETRY_ATTEMPTS', '24'))
 
-# Блокировка для контроля доступа к Райфайзен банку
-raiffeisen_lock = threading.Lock()
-# Флаг блокировки Райфайзен
-raiffeisen_blocked = False
-# Время последней блокировки
-raiffeisen_block_time = 0
-
 # Кастомное исключение для лимита API
 class ApiLimitExceeded(Exception):
     """Исключение, возникающее при превышении лимита API запросов"""
@@ -53,54 +91,158 @@ class ApiLimitExceeded(Exception):
         super().__init__(self.message)
 
 
+class BrowserPoolError(Exception):
+    """Исключение, возникающее, когда пул браузеров не может выдать браузер"""
+
+
+class TokenBucket:
+    """Потокобезопасное ведро токенов для ограничения частоты запросов"""
+    
+    __slots__ = ("capacity", "refill_rate", "_tokens", "_updated", "_lock")
+    
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Инициализация ведра токенов
+        
+        :param capacity: Емкость ведра (максимальный размер всплеска запросов)
+        :param refill_rate: Скорость пополнения (токенов в секунду)
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """Начисляет токены за время, прошедшее с последнего обновления"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+    
+    def consume(self, tokens: float = 1) -> bool:
+        """
+        Забирает токены из ведра
+        
+        :param tokens: Количество токенов
+        :return: True, если токенов хватило, False в противном случае
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def drain(self) -> None:
+        """Опустошает ведро (например, после ответа о превышении лимита)"""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+    
+    @property
+    def tokens(self) -> float:
+        """Текущее количество токенов"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+    
+    def time_until_available(self, tokens: float = 1) -> float:
+        """
+        Время в секундах, через которое в ведре накопится указанное количество токенов
+        
+        :param tokens: Количество токенов
+        :return: Время ожидания в секундах
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.refill_rate)
+
+
+# Ведро токенов для доступа к Райфайзен банку: после ошибки ведро опустошается,
+# и запросы возобновляются постепенно, по мере пополнения токенов
+raiffeisen_bucket = TokenBucket(capacity=RAIFFEISEN_BURST, refill_rate=1.0 / RAIFFEISEN_REFILL_SECONDS)
+# Момент (time.monotonic), до которого запросы к Райфайзен проходят через ведро токенов
+raiffeisen_recovery_until = 0.0
+
+
 # Функция для проверки, не заблокирован ли Райфайзен банк
 def is_raiffeisen_blocked():
     """
     Проверяет, находится ли сайт Райфайзен в состоянии блокировки.
-    Если с момента блокировки прошло более часа, снимает блокировку.
+    После блокировки каждый запрос забирает токен из ведра; когда ведро успевает
+    полностью наполниться, ограничение снимается.
     
     :return: True, если сайт заблокирован, False в противном случае
     """
-    global raiffeisen_blocked, raiffeisen_block_time
+    # Быстрый путь: с момента последней блокировки ведро успело наполниться
+    if time.monotonic() >= raiffeisen_recovery_until:
+        return False
     
-    with raiffeisen_lock:
-        if not raiffeisen_blocked:
-            return False
-        
-        # Проверяем, не прошло ли время блокировки
-        current_time = time.time()
-        if current_time - raiffeisen_block_time >= RAIFFEISEN_BLOCK_TIME_SECONDS:
-            logger.info("Время блокировки Райфайзен банка истекло, снимаем блокировку")
-            raiffeisen_blocked = False
-            return False
-            
-        # Вычисляем, сколько времени осталось до конца блокировки
-        remaining_time = int((raiffeisen_block_time + RAIFFEISEN_BLOCK_TIME_SECONDS - current_time) / 60)  # в минутах
-        logger.info(f"Райфайзен банк заблокирован еще {remaining_time} минут")
-        return True
+    if raiffeisen_bucket.consume(1):
+        return False
+    
+    logger.info(f"Райфайзен банк заблокирован, доступно токенов: {raiffeisen_bucket.tokens:.2f} из {RAIFFEISEN_BURST}")
+    return True
 
 # Функция для установки блокировки Райфайзен банка
 def set_raiffeisen_blocked():
     """
-    Устанавливает флаг блокировки сайта Райфайзен и сохраняет время блокировки
+    Опустошает ведро токенов Райфайзен банка и включает ограничение запросов
+    на время полного пополнения ведра
     """
-    global raiffeisen_blocked, raiffeisen_block_time
-    
-    with raiffeisen_lock:
-        # Устанавливаем блокировку, только если она еще не установлена или прошло больше 10 минут
-        current_time = time.time()
-        if not raiffeisen_blocked or (current_time - raiffeisen_block_time > RAIFFEISEN_SECONDARY_WAIT_SECONDS):
-            raiffeisen_blocked = True
-            raiffeisen_block_time = current_time
-            logger.warning(f"Установлена блокировка для Райфайзен банка на {RAIFFEISEN_BLOCK_TIME_SECONDS // 60} минут")
-        else:
-            # Если блокировка уже установлена, выводим информацию о времени ожидания
-            remaining_time = int((raiffeisen_block_time + RAIFFEISEN_BLOCK_TIME_SECONDS - current_time) / 60)  # в минутах
-            logger.info(f"Райфайзен банк уже заблокирован, осталось ждать {remaining_time} минут")
+    global raiffeisen_recovery_until
+    
+    raiffeisen_bucket.drain()
+    raiffeisen_recovery_until = time.monotonic() + RAIFFEISEN_BURST * RAIFFEISEN_REFILL_SECONDS
+    logger.warning(f"Установлена блокировка для Райфайзен банка, доступно токенов: 0 из {RAIFFEISEN_BURST} "
+                   f"(один токен каждые {RAIFFEISEN_REFILL_SECONDS:g} секунд)")
+
+# Весовые коэффициенты для контрольных цифр ИНН
+_INN10_WEIGHTS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_1 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_2 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+# Включает проверку контрольных цифр ИНН при предварительной фильтрации
+VALIDATE_INN_CHECKSUM = os.getenv('VALIDATE_INN_CHECKSUM', '0') == '1'
+
+
+def _inn_control_digit(digits: List[int], weights: Tuple[int, ...]) -> int:
+    """Вычисляет контрольную цифру ИНН по весовым коэффициентам"""
+    return sum(d * w for d, w in zip(digits, weights)) % 11 % 10
+
+
+def is_valid_inn(inn: Optional[str], check_checksum: bool = False) -> bool:
+    """
+    Проверяет формат ИНН: 10 или 12 цифр и, опционально, контрольные цифры
+    
+    :param inn: ИНН для проверки
+    :param check_checksum: Проверять ли контрольные цифры
+    :return: True, если ИНН корректен
+    """
+    if not inn or not inn.isdigit() or len(inn) not in (10, 12):
+        return False
+    if not check_checksum:
+        return True
+    
+    digits = [int(c) for c in inn]
+    if len(digits) == 10:
+        return _inn_control_digit(digits, _INN10_WEIGHTS) == digits[9]
+    return (_inn_control_digit(digits, _INN12_WEIGHTS_1) == digits[10]
+            and _inn_control_digit(digits, _INN12_WEIGHTS_2) == digits[11])
+
 
 class KeyRotator:
     """Класс для ротации API ключей"""
     
+    __slots__ = ("keys", "current_index", "logger", "_bad_until", "_lock", "_cycle")
+    # Атрибуты, передаваемые при сериализации (блокировка и итератор пересоздаются)
+    _PICKLED_SLOTS = ("keys", "current_index", "logger", "_bad_until")
+    
+    # Время исключения ключа из ротации (секунды): после ошибки авторизации
+    # и после превышения лимита запросов, если сервер не передал Retry-After
+    forbidden_cooldown = 3600
+    rate_limit_cooldown = 60
+    
     def __init__(self, keys: List[str], source_name: str):
         """
         Инициализация менеджера ротации ключей
@@ -111,11 +253,52 @@ class KeyRotator:
         self.keys = keys
         self.current_index = 0
         self.logger = logging.getLogger(f"TIN_Parser.{source_name}.KeyRotator")
+        # Время (monotonic), до которого ключ временно исключен из ротации
+        self._bad_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._cycle = self._build_cycle()
         if not keys:
             self.logger.error("Список ключей пуст!")
         else:
             self.logger.info(f"Инициализирован ротатор ключей с {len(keys)} ключами")
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """Блокировка и итератор не сериализуются (ротатор передается в дочерние процессы)"""
+        return {name: getattr(self, name) for name in self._PICKLED_SLOTS}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Восстанавливает блокировку и итератор после десериализации"""
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.Lock()
+        self._cycle = self._build_cycle()
+    
+    def _build_cycle(self):
+        """
+        Создает бесконечный итератор по парам (индекс, ключ), следующим элементом
+        которого будет ключ после текущего
+        """
+        cycle = itertools.cycle(enumerate(self.keys))
+        if self.keys:
+            for _ in range(self.current_index + 1):
+                next(cycle)
+        return cycle
+    
+    def _is_available(self, key: str) -> bool:
+        """
+        Проверяет, не исключен ли ключ из ротации
+        
+        :param key: API ключ
+        :return: True, если ключ можно использовать
+        """
+        bad_until = self._bad_until.get(key)
+        if bad_until is None:
+            return True
+        if time.monotonic() >= bad_until:
+            del self._bad_until[key]
+            return True
+        return False
+    
     def get_current_key(self) -> Optional[str]:
         """
         Получить текущий активный ключ
@@ -128,18 +311,85 @@ class KeyRotator:
     
     def rotate_key(self) -> Optional[str]:
         """
-        Переключиться на следующий ключ
+        Переключиться на следующий ключ (ключи, отмеченные через mark_bad, пропускаются)
         
         :return: Следующий ключ или None, если список пуст
         """
         if not self.keys:
             return None
-            
-        self.current_index = (self.current_index + 1) % len(self.keys)
-        key = self.keys[self.current_index]
+        
+        with self._lock:
+            # Если все ключи временно исключены, делаем полный круг и остаемся на текущем
+            for _ in range(len(self.keys)):
+                self.current_index, key = next(self._cycle)
+                if self._is_available(key):
+                    break
         self.logger.info(f"Переключение на ключ {self.current_index + 1}/{len(self.keys)}")
         return key
     
+    def mark_bad(self, key: str, cooldown: float) -> None:
+        """
+        Временно исключает ключ из ротации
+        
+        :param key: API ключ
+        :param cooldown: Время исключения в секундах
+        """
+        with self._lock:
+            self._bad_until[key] = time.monotonic() + cooldown
+        self.logger.warning(f"Ключ временно исключен из ротации на {int(cooldown)} секунд")
+    
+    def mark_failed(self, key: str, status: int, retry_after: Optional[float] = None) -> None:
+        """
+        Исключает из ротации ключ, запрос с которым завершился ошибкой: после 401 и 403 - на час,
+        после 429 - на время из Retry-After. Исключение действует для всех компаний,
+        по истечении времени ключ снова пробуется
+        
+        :param key: API ключ
+        :param status: HTTP статус ответа (401, 403 или 429)
+        :param retry_after: Значение Retry-After в секундах, если сервер его передал
+        """
+        if status in (401, 403):
+            cooldown = self.forbidden_cooldown
+        elif retry_after is not None:
+            cooldown = retry_after
+        else:
+            cooldown = self.rate_limit_cooldown
+        self.mark_bad(key, cooldown)
+    
+    def mark_succeeded(self, key: str) -> None:
+        """
+        Возвращает ключ в ротацию после успешного запроса
+        
+        :param key: API ключ
+        """
+        if key in self._bad_until:
+            with self._lock:
+                self._bad_until.pop(key, None)
+    
+    def get_available_key(self) -> Optional[str]:
+        """
+        Получить текущий ключ, если он не исключен из ротации, иначе переключиться на следующий доступный
+        
+        :return: Доступный ключ или None, если все ключи исключены или список пуст
+        """
+        if not self.keys:
+            return None
+        key = self.keys[self.current_index]
+        if not self._bad_until or self._is_available(key):
+            return key
+        key = self.rotate_key()
+        return key if self._is_available(key) else None
+    
+    def get_available_keys_count(self) -> int:
+        """
+        Получить количество ключей, не исключенных из ротации
+        
+        :return: Количество доступных ключей
+        """
+        if not self._bad_until:
+            return len(self.keys)
+        return sum(1 for key in self.keys if self._is_available(key))
+    
     def is_empty(self) -> bool:
         """
         Проверить, пуст ли список ключей
@@ -156,12 +406,203 @@ class KeyRotator:
         """
         return len(self.keys)
 
+
+@functools.lru_cache(maxsize=None)
+def _resolve_chromedriver_path() -> Optional[str]:
+    """
+    Находит исполняемый файл ChromeDriver с учетом операционной системы.
+    Поиск выполняется один раз за процесс, повторные запуски и перезапуски браузеров берут готовый путь.
+
+    :return: Путь к ChromeDriver или None, если он не найден
+    """
+    if sys.platform == 'win32':
+        candidates = (os.path.join(os.getcwd(), 'chromedriver.exe'), 'C:/chromedriver/chromedriver.exe')
+    else:
+        candidates = ('./chromedriver',)
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class ChromeDriverPool:
+    """
+    Пул браузеров Chrome для параллельной работы через Selenium.
+    Браузеры создаются один раз и переиспользуются между вызовами parse_companies,
+    синхронные вызовы Selenium выполняются в отдельном пуле потоков.
+    """
+
+    def __init__(self, chromedriver_path: str, options: Options, size: int = 1,
+                 page_load_timeout: int = 60, wait_timeout: int = 10,
+                 on_create: Optional[Callable[[webdriver.Chrome], None]] = None,
+                 acquire_timeout: float = 1800, create_attempts: int = 3,
+                 name: str = "ChromeDriverPool"):
+        """
+        Инициализация пула браузеров
+
+        :param chromedriver_path: Путь к исполняемому файлу ChromeDriver
+        :param options: Настройки Chrome
+        :param size: Количество браузеров в пуле
+        :param page_load_timeout: Таймаут загрузки страницы (секунды)
+        :param wait_timeout: Таймаут ожидания элементов (секунды)
+        :param on_create: Функция, вызываемая для каждого нового браузера
+        :param acquire_timeout: Максимальное время ожидания свободного браузера (секунды)
+        :param create_attempts: Число попыток создать браузер при перезапуске
+        :param name: Название пула для логирования
+        """
+        self.chromedriver_path = chromedriver_path
+        self.options = options
+        self.size = max(1, size)
+        self.page_load_timeout = page_load_timeout
+        self.wait_timeout = wait_timeout
+        self.on_create = on_create
+        self.acquire_timeout = acquire_timeout
+        self.create_attempts = max(1, create_attempts)
+        self.logger = logging.getLogger(f"TIN_Parser.{name}")
+
+        # Пары (драйвер, объект ожидания): все созданные и свободные
+        self._items: List[Tuple[webdriver.Chrome, WebDriverWait]] = []
+        self._free: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Пул не может выдать браузер: все браузеры потеряны после неудачных перезапусков
+        self._broken = False
+
+    @property
+    def started(self) -> bool:
+        """Запущен ли пул"""
+        return self._free is not None
+
+    def _create(self) -> Tuple[webdriver.Chrome, WebDriverWait]:
+        """Создает браузер и объект ожидания для него (выполняется в пуле потоков)"""
+        driver = webdriver.Chrome(service=Service(executable_path=self.chromedriver_path), options=self.options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        if self.on_create:
+            self.on_create(driver)
+        return driver, WebDriverWait(driver, self.wait_timeout)
+
+    def _quit(self, driver: webdriver.Chrome) -> None:
+        """Закрывает браузер, не выбрасывая исключений"""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.error(f"Ошибка при закрытии браузера: {e}")
+
+    async def start(self) -> None:
+        """
+        Запускает браузеры пула (повторный вызов ничего не делает). Пул, потерявший
+        все браузеры после неудачных перезапусков, закрывается и запускается заново
+        """
+        if self.started:
+            if not self._broken:
+                return
+            self.logger.warning("В пуле не осталось браузеров, запускаем пул заново")
+            await self.close()
+
+        self.logger.info(f"Запускаем браузеры: {self.size}")
+        self._executor = ThreadPoolExecutor(max_workers=self.size)
+        self._free = asyncio.Queue()
+        self._broken = False
+        results = await asyncio.gather(*(self.run(self._create) for _ in range(self.size)), return_exceptions=True)
+        self._items = [item for item in results if not isinstance(item, BaseException)]
+        errors = [item for item in results if isinstance(item, BaseException)]
+        if errors:
+            await self.close()
+            raise errors[0]
+        for item in self._items:
+            self._free.put_nowait(item)
+
+    async def acquire(self) -> Tuple[webdriver.Chrome, WebDriverWait]:
+        """
+        Забирает свободный браузер из пула, ожидая его освобождения не дольше acquire_timeout
+
+        :return: Пара (драйвер, объект ожидания)
+        :raises BrowserPoolError: Если пул не запущен, потерял все браузеры или браузер не освободился вовремя
+        """
+        if self._free is None or self._broken:
+            raise BrowserPoolError("Пул браузеров не запущен или не содержит ни одного браузера")
+        try:
+            item = await asyncio.wait_for(self._free.get(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise BrowserPoolError(f"Свободный браузер не освободился за {self.acquire_timeout:g} секунд")
+        if item is None:
+            # Пул потерял все браузеры: передаем признак следующему ожидающему
+            self._free.put_nowait(None)
+            raise BrowserPoolError("Пул браузеров не содержит ни одного браузера")
+        return item
+
+    def release(self, item: Tuple[webdriver.Chrome, WebDriverWait]) -> None:
+        """
+        Возвращает браузер в пул
+
+        :param item: Пара (драйвер, объект ожидания)
+        """
+        if self._free is not None:
+            self._free.put_nowait(item)
+
+    async def run(self, fn: Callable, *args):
+        """
+        Выполняет синхронную функцию в пуле потоков, не блокируя цикл событий
+
+        :param fn: Функция
+        :param args: Аргументы функции
+        :return: Результат функции
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def recreate(self, item: Tuple[webdriver.Chrome, WebDriverWait]) -> Optional[Tuple[webdriver.Chrome, WebDriverWait]]:
+        """
+        Закрывает браузер и создает вместо него новый (браузер должен быть взят из пула).
+        Создание повторяется до create_attempts раз; если браузер создать не удалось, место
+        в пуле освобождается, а когда в пуле не остается ни одного браузера, ожидающие
+        в acquire получают BrowserPoolError вместо бесконечного ожидания
+
+        :param item: Пара (драйвер, объект ожидания)
+        :return: Новая пара (драйвер, объект ожидания) или None, если браузер создать не удалось
+                 (старый браузер в этом случае уже закрыт, возвращать его в пул не нужно)
+        """
+        self.logger.info("Перезапускаем браузер")
+        await self.run(self._quit, item[0])
+        if item in self._items:
+            self._items.remove(item)
+
+        for attempt in range(self.create_attempts):
+            try:
+                new_item = await self.run(self._create)
+            except Exception as e:
+                self.logger.error(f"Не удалось создать браузер (попытка {attempt + 1}/{self.create_attempts}): {e}")
+                if attempt < self.create_attempts - 1:
+                    await asyncio.sleep(2 ** attempt)
+                continue
+            self._items.append(new_item)
+            return new_item
+
+        self.logger.error(f"Браузер не удалось перезапустить, в пуле осталось браузеров: {len(self._items)}")
+        if not self._items:
+            self._broken = True
+            if self._free is not None:
+                self._free.put_nowait(None)
+        return None
+
+    async def close(self) -> None:
+        """Закрывает все браузеры пула (параллельно, в пуле потоков) и пул потоков"""
+        items, self._items = self._items, []
+        if items:
+            self.logger.info("Закрываем браузеры...")
+            await asyncio.gather(*(self.run(self._quit, driver) for driver, _ in items))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._free = None
+        self._broken = False
+
+
 class FocusKonturParser(BaseSiteParser):
     """Парсер для сайта focus.kontur.ru"""
     
+    env_prefix = "FOCUS_KONTUR"
+    
     def __init__(self, rate_limit: float = 2.0, max_retries: int = 1):
-        super().__init__(rate_limit)
-        self.site_name = "focus.kontur.ru"
+        super().__init__("focus.kontur.ru", rate_limit)
         self.search_url = "https://focus.kontur.ru/search?country=RU"
         self.max_retries = max_retries
         
@@ -179,58 +620,86 @@ class FocusKonturParser(BaseSiteParser):
         self.search_input_xpath = "/html/body/div[2]/div[2]/div/div/div/noindex/div/div/div[1]/div[2]/div/div/div[1]/input"
         self.search_button_xpath = "/html/body/div[2]/div[2]/div/div/div/noindex/div/div/div[1]/div[2]/div/div/div[1]/div/button"
         
+        # Готовые локаторы (стратегия + селектор), чтобы не собирать их при каждом обращении
+        self._search_input_loc = (By.XPATH, self.search_input_xpath)
+        self._search_button_loc = (By.XPATH, self.search_button_xpath)
+        self._uneven_loc = (By.CLASS_NAME, "unevenIndent")
+        
         # Настройки таймаутов и ожидания
         self.page_load_timeout = 60  # Таймаут загрузки страницы (секунды)
         self.wait_timeout = 10  # Таймаут для ожидания элементов (секунды)
-        self.wait_after_search = 10  # Ожидание после поиска (секунды)
+        self.wait_after_search = 10  # Максимальное ожидание блока с данными после поиска (секунды)
         
-        # Регулярные выражения для извлечения данных
-        self.chairman_pattern = re.compile(r'(?:Председатель|Директор)[^\n]*\n([А-ЯЁ][а-яё]+ [А-ЯЁ][а-яё]+ [А-ЯЁ][а-яё]+)')
-        self.chairman_inn_pattern = re.compile(r'ИНН (\d{10,12})')
+        # Регулярное выражение для извлечения данных о руководителе за один проход:
+        # строка с должностью, ФИО в той же или следующей строке (части ФИО могут быть
+        # двойными через дефис, например "Петров-Водкин") и ближайший ИНН после него
+        self.director_block_re = re.compile(
+            r'(?:Председатель|Директор|руководитель)[^\n]*?\s*'
+            r'(?P<name>[А-ЯЁ][а-яё]+(?:-[А-ЯЁа-яё][а-яё]+)*(?:[ \t]+[А-ЯЁ][а-яё]+(?:-[А-ЯЁа-яё][а-яё]+)*){1,2})'
+            r'(?:[\s\S]{0,400}?ИНН\s+(?P<inn>\d{10,12}))?'
+        )
         
         # Драйвер браузера (инициализируется в parse_companies)
         self.driver = None
         self.wait = None
+        self.wait_fast = None  # Ожидание с частым опросом для быстрых условий
+        self.wait_block = None  # Ожидание блока с данными компании после поиска
         self.current_retry = 0
+        
     
     async def parse_companies(self, companies: List[CompanyData]) -> List[CompanyData]:
         """Парсит список компаний с использованием одного экземпляра браузера"""
         results = []
         self.logger.info(f"Начинаем обработку {len(companies)} компаний")
         
+        # Получаем ссылку на data_manager для обновления результатов
+        data_manager = self._get_data_manager()
+        
+        # Отсеиваем компании с некорректным ИНН до запуска браузера
+        valid_companies = []
+        for company in companies:
+            if is_valid_inn(company.inn, VALIDATE_INN_CHECKSUM):
+                valid_companies.append(company)
+                continue
+            
+            self.logger.warning(f"Некорректный ИНН {company.inn} у компании {company.name}, пропускаем")
+            company.chairman_name = "не найдено"
+            company.chairman_inn = "не найдено"
+            company.source = self.site_name
+            results.append(company)
+            if data_manager:
+                data_manager.update_results(company)
+        
+        companies = valid_companies
+        if not companies:
+            return results
+        
         try:
             # Инициализация браузера (один раз для всех компаний)
-            chromedriver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path = 'C:/chromedriver/chromedriver.exe'
-                if not os.path.exists(chromedriver_path):
-                    self.logger.error(f"ChromeDriver не найден по пути {chromedriver_path}")
-                    return results
+            chromedriver_path = _resolve_chromedriver_path()
+            if chromedriver_path is None:
+                self.logger.error("ChromeDriver не найден")
+                return results
             
             # Создаем сервис и драйвер
             service = Service(executable_path=chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=self.options)
-            self.driver.set_page_load_timeout(self.page_load_timeout)
-            self.wait = WebDriverWait(self.driver, self.wait_timeout)
-            
-            # Получаем ссылку на data_manager для обновления результатов
-            data_manager = self._get_data_manager()
+            self._start_browser(service)
             
             # Обработка всех компаний
             for i, company in enumerate(companies):
                 try:
                     # Проверяем на прерывание программы перед каждой компанией
                     try:
-                        # Используем asyncio.sleep с очень маленьким таймаутом для проверки прерываний
-                        await asyncio.sleep(0.01)
+                        # Уступаем управление циклу событий без таймера, чтобы получить отмену
+                        await asyncio.sleep(0)
                     except asyncio.CancelledError:
                         self.logger.info("Обнаружено прерывание, останавливаем парсинг")
                         break
                     
                     self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
                     
-                    # Соблюдаем задержку между запросами
-                    await asyncio.sleep(self.rate_limit)
+                    # Соблюдаем частоту запросов
+                    await self._rl.acquire()
                     
                     # Сбрасываем счетчик попыток для новой компании
                     self.current_retry = 0
@@ -248,22 +717,21 @@ class FocusKonturParser(BaseSiteParser):
                     else:
                         self.logger.warning(f"Не удалось получить данные для {company.name}")
                         
-                    # После каждой 10-й компании проверяем, жив ли браузер
-                    if (i + 1) % 10 == 0:
+                    # После каждой 25-й компании проверяем, жив ли процесс chromedriver
+                    # (локальная проверка без обращения к браузеру)
+                    if (i + 1) % 25 == 0:
                         self.logger.info(f"Проверка активности браузера... ([{i+1}/{len(companies)}])")
                         try:
-                            self.driver.current_url
-                            if "https" not in self.driver.current_url:
-                                raise WebDriverException  # Проверка активности браузера
+                            process = self.driver.service.process
+                            if process is None or process.poll() is not None:
+                                raise WebDriverException("chromedriver exited")
                         except WebDriverException:
                             self.logger.warning("Браузер перестал отвечать, перезапускаем")
                             # Корректно закрываем браузер перед пересозданием
                             self._ensure_browser_closed()
                                     
                             # Пересоздаем драйвер
-                            self.driver = webdriver.Chrome(service=service, options=self.options)
-                            self.driver.set_page_load_timeout(self.page_load_timeout)
-                            self.wait = WebDriverWait(self.driver, self.wait_timeout)
+                            self._start_browser(service)
                             
                 except Exception as e:
                     self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
@@ -274,9 +742,7 @@ class FocusKonturParser(BaseSiteParser):
                         
                         # Пересоздаем драйвер
                         try:
-                            self.driver = webdriver.Chrome(service=service, options=self.options)
-                            self.driver.set_page_load_timeout(self.page_load_timeout)
-                            self.wait = WebDriverWait(self.driver, self.wait_timeout)
+                            self._start_browser(service)
                         except Exception as browser_error:
                             self.logger.error(f"Не удалось перезапустить браузер: {browser_error}")
                             break  # Прекращаем обработку, если браузер не удалось перезапустить
@@ -296,20 +762,22 @@ class FocusKonturParser(BaseSiteParser):
         
         for attempt in range(self.max_retries):
             try:
-                # Открываем страницу поиска
+                # Открываем страницу поиска заново для каждой компании: на странице "ничего не найдено"
+                # предыдущего поиска условие _search_finished выполнилось бы сразу, до результатов нового
                 self.logger.info(f"Открываем страницу поиска для компании {company.inn} (попытка {attempt+1}/{self.max_retries})")
                 self.driver.get(self.search_url)
+                current_url = self.driver.current_url
                 
                 # Проверка на некорректный URL (data: и др.)
-                if self.driver.current_url.startswith('data.;') or not self.driver.current_url.startswith('http'):
-                    self.logger.error(f"Браузер вернул некорректный URL: {self.driver.current_url}")
+                if current_url.startswith('data.;') or not current_url.startswith('http'):
+                    self.logger.error(f"Браузер вернул некорректный URL: {current_url}")
                     if attempt < self.max_retries - 1:
                         await asyncio.sleep(2)
                         # Пробуем обновить страницу
                         try:
                             self.driver.refresh()
                             await asyncio.sleep(3)  # Ждем после обновления
-                        except:
+                        except WebDriverException:
                             pass
                         continue
                     else:
@@ -319,7 +787,7 @@ class FocusKonturParser(BaseSiteParser):
                         return company
                 
                 # Проверка на блокировку
-                if "вы превысили лимит запросов к серверу" in self.driver.page_source.lower():
+                if "вы превысили лимит запросов к серверу" in self._page_text_lower():
                     self.logger.warning(f"Сайт focus.kontur.ru заблокировал парсер.")
                     return None
                 
@@ -333,7 +801,7 @@ class FocusKonturParser(BaseSiteParser):
                 
                 # Ждем загрузки поля поиска
                 try:
-                    search_input = self.wait.until(EC.presence_of_element_located((By.XPATH, self.search_input_xpath)))
+                    search_input = self.wait_fast.until(EC.presence_of_element_located(self._search_input_loc))
                 except TimeoutException:
                     self.logger.warning(f"Тайм-аут при ожидании элемента поиска (попытка {attempt+1}/{self.max_retries})")
                     if attempt < self.max_retries - 1:
@@ -351,7 +819,7 @@ class FocusKonturParser(BaseSiteParser):
                 
                 # Нажимаем кнопку поиска или Enter
                 try:
-                    search_button = self.driver.find_element(By.XPATH, self.search_button_xpath)
+                    search_button = self.driver.find_element(*self._search_button_loc)
                     search_button.click()
                 except NoSuchElementException:
                     search_input.send_keys(Keys.RETURN)
@@ -359,10 +827,11 @@ class FocusKonturParser(BaseSiteParser):
                 # Ждем загрузки результатов поиска
                 try:
                     # Ждем появления страницы компании или страницы "ничего не найдено"
-                    self.wait.until(lambda d: 'entity' in d.current_url or 'проверьте запрос на ошибки' in d.page_source.lower() or 'data:' in d.current_url)
+                    self.wait.until(self._search_finished)
 
                     # Проверка на некорректный URL
-                    if self.driver.current_url.startswith('data:'):
+                    current_url = self.driver.current_url
+                    if current_url.startswith('data:'):
                         self.logger.error(f"Браузер вернул data: URL после поиска")
                         if attempt < self.max_retries - 1:
                             await asyncio.sleep(2)
@@ -373,11 +842,8 @@ class FocusKonturParser(BaseSiteParser):
                             company.chairman_inn = "не найдено"
                             return company
                     
-                    # Даем странице дополнительное время загрузиться (особенно важно для директора)
-                    await asyncio.sleep(self.wait_after_search)
-                    
-                    # Если мы на странице "ничего не найдено"
-                    if 'проверьте запрос на ошибки' in self.driver.page_source.lower():
+                    # Если мы на странице "ничего не найдено" (на странице компании проверка не нужна)
+                    if 'entity' not in current_url and 'проверьте запрос на ошибки' in self._page_text_lower():
                         self.logger.warning(f"Компания {company.inn} не найдена на focus.kontur.ru")
                         # Возвращаем данные с отметкой "не найдено"
                         company.chairman_name = "не найдено"
@@ -385,64 +851,34 @@ class FocusKonturParser(BaseSiteParser):
                         return company
                     
                     # Если мы на странице поиска, но нашли только одну компанию, нажимаем на неё
-                    if 'entity' not in self.driver.current_url and 'search' in self.driver.current_url:
+                    if 'entity' not in current_url and 'search' in current_url:
                         try:
                             company_link = self.driver.find_element(By.CSS_SELECTOR, "a.company-name")
                             company_link.click()
-                            # Ждем загрузки страницы компании
-                            await asyncio.sleep(self.wait_after_search)
                         except NoSuchElementException:
                             pass
                     
                     # Получаем весь текст из блока информации о компании
                     try:
-                        # Ищем блок с информацией по классу unevenIndent
+                        # Ждем появления блока с информацией (класс unevenIndent) не дольше wait_after_search,
+                        # вместо фиксированной паузы после поиска
                         self.logger.info(f"Получаем информацию о компании из блока unevenIndent")
-                        div_elem = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "unevenIndent")))
+                        div_elem = self.wait_block.until(EC.presence_of_element_located(self._uneven_loc))
                         
                         # Получаем весь текст
                         company_text = div_elem.text
                         
-                        # Парсим данные о председателе
-                        # Шаг 1: Ищем строку с упоминанием "Председатель" или "Директор"
-                        chairman_line = None
-                        lines = company_text.split('\n')
-                        for i, line in enumerate(lines):
-                            if "Председатель" in line or "Директор" in line or "руководитель" in line:
-                                chairman_line = i
-                                break
-                        
-                        if chairman_line is not None:
-                            # Шаг 2: Имя директора обычно на следующей строке после должности
-                            if chairman_line + 1 < len(lines):
-                                chairman_name = lines[chairman_line + 1].strip()
-                                # Проверяем, что это похоже на ФИО (начинается с заглавной буквы и содержит пробелы)
-                                if chairman_name and chairman_name[0].isupper() and ' ' in chairman_name:
-                                    company.chairman_name = chairman_name
-                                    self.logger.info(f"Извлечено имя директора: {chairman_name}")
-                                else:
-                                    # Если имя не в следующей строке, то возможно оно в той же строке
-                                    name_parts = [word for word in lines[chairman_line].split() if word[0].isupper() and len(word) > 1]
-                                    if len(name_parts) >= 2:  # Минимум имя и фамилия
-                                        # Пропускаем слово "Председатель"/"Директор"
-                                        if name_parts[0] in ["Председатель", "Директор"]:
-                                            name_parts = name_parts[1:]
-                                        
-                                        if name_parts:
-                                            company.chairman_name = " ".join(name_parts)
-                                            self.logger.info(f"Извлечено имя директора из строки должности: {company.chairman_name}")
-                        
-                            # Шаг 3: Ищем ИНН директора (обычно в следующих 3-5 строках)
-                            for j in range(chairman_line, min(chairman_line + 5, len(lines))):
-                                inn_match = self.chairman_inn_pattern.search(lines[j])
-                                if inn_match:
-                                    company.chairman_inn = inn_match.group(1)
-                                    self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
-                                    break
-                        
-                            if not company.chairman_inn:
+                        # Парсим данные о председателе одним проходом регулярного выражения
+                        match = self.director_block_re.search(company_text)
+                        if match:
+                            company.chairman_name = match.group('name')
+                            self.logger.info(f"Извлечено имя директора: {company.chairman_name}")
+                            
+                            company.chairman_inn = match.group('inn') or "не найдено"
+                            if match.group('inn'):
+                                self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
+                            else:
                                 self.logger.warning(f"ИНН директора не найден для компании {company.inn}")
-                                company.chairman_inn = "не найдено"
                         else:
                             self.logger.warning(f"Информация о директоре не найдена для компании {company.inn}")
                             company.chairman_name = "не найдено"
@@ -500,32 +936,51 @@ class FocusKonturParser(BaseSiteParser):
         company.chairman_inn = "не найдено"
         return company
 
-    def _get_data_manager(self) -> Optional[DataManager]:
-        """Получает ссылку на глобальный data_manager для обновления результатов"""
-        try:
-            # Ищем data_manager в глобальных переменных
-            from parser_base import DataManager
-            data_manager = None
-            
-            # Ищем data_manager в globals()
-            for var_name, var_value in globals().items():
-                if isinstance(var_value, DataManager):
-                    data_manager = var_value
-                    break
-                    
-            # Также ищем в ссылках из модуля main
-            if data_manager is None:
-                try:
-                    import main
-                    if hasattr(main, 'data_manager') and main.data_manager is not None:
-                        data_manager = main.data_manager
-                except:
-                    pass
-            
-            return data_manager
-        except Exception as e:
-            self.logger.error(f"Ошибка при получении data_manager: {e}")
-            return None
+    def _page_text_lower(self) -> str:
+        """
+        Возвращает видимый текст страницы в нижнем регистре.
+        Передает через драйвер только innerText, а не всю разметку page_source.
+        
+        :return: Текст страницы
+        """
+        return self.driver.execute_script(
+            "return document.body ? document.body.innerText.toLowerCase() : '';"
+        ) or ""
+    
+    def _search_finished(self, driver) -> bool:
+        """
+        Условие ожидания результатов поиска: открыта страница компании,
+        страница "ничего не найдено" или некорректный data: URL
+        
+        :param driver: Экземпляр WebDriver
+        :return: True, если поиск завершен
+        """
+        current_url = driver.current_url
+        if 'entity' in current_url or 'data:' in current_url:
+            return True
+        return 'проверьте запрос на ошибки' in self._page_text_lower()
+
+    def _start_browser(self, service: Service) -> None:
+        """
+        Запускает браузер и создает объекты ожидания для него
+        
+        :param service: Сервис ChromeDriver
+        """
+        self.driver = webdriver.Chrome(service=service, options=self.options)
+        self.driver.set_page_load_timeout(self.page_load_timeout)
+        self.wait = WebDriverWait(self.driver, self.wait_timeout)
+        self.wait_fast = WebDriverWait(
+            self.driver,
+            self.wait_timeout,
+            poll_frequency=0.1,
+            ignored_exceptions=(StaleElementReferenceException,)
+        )
+        self.wait_block = WebDriverWait(
+            self.driver,
+            self.wait_after_search,
+            poll_frequency=0.1,
+            ignored_exceptions=(StaleElementReferenceException,)
+        )
 
     def _ensure_browser_closed(self) -> None:
         """
@@ -543,10 +998,15 @@ class FocusKonturParser(BaseSiteParser):
                 # Гарантируем, что ссылки на драйвер сбрасываются в любом случае
                 self.driver = None
                 self.wait = None
+                self.wait_fast = None
+                self.wait_block = None
 
 class CheckoParser(BaseSiteParser):
     """Парсер для сайта checko.ru с использованием API"""
     
+    env_prefix = "CHECKO"
+    default_concurrency = 8
+    
     def __init__(self, token: str = None, rate_limit: float = 2.0):
         """
         Инициализация клиента Checko.ru
@@ -579,31 +1039,6 @@ class CheckoParser(BaseSiteParser):
             "Accept": "application/json",
         }
     
-    def _load_api_keys_from_env(self, env_prefix: str) -> List[str]:
-        """
-        Загружает API ключи из переменных окружения с указанным префиксом
-        
-        :param env_prefix: Префикс для переменных окружения (например, 'CHECKO_TOKEN')
-        :return: Список найденных ключей
-        """
-        keys = []
-        # Ищем основной ключ
-        main_key = os.getenv(env_prefix)
-        if main_key:
-            keys.append(main_key)
-        
-        # Ищем дополнительные ключи с номерами (CHECKO_TOKEN_1, CHECKO_TOKEN_2, и т.д.)
-        i = 1
-        while True:
-            key = os.getenv(f"{env_prefix}_{i}")
-            if not key:
-                break
-            keys.append(key)
-            i += 1
-        
-        self.logger.info(f"Загружено {len(keys)} ключей с префиксом {env_prefix}")
-        return keys
-    
     async def parse_companies(self, companies: List[CompanyData]) -> List[CompanyData]:
         """Парсит список компаний через API checko.ru"""
         results = []
@@ -625,43 +1060,42 @@ class CheckoParser(BaseSiteParser):
             self.logger.warning(f"Дневной лимит API запросов ({self.api_daily_limit}) исчерпан. Прерываем обработку.")
             return results
         
-        # Обработка всех компаний
-        for i, company in enumerate(companies):
+        # Событие остановки обработки при исчерпании лимита API
+        limit_exceeded = asyncio.Event()
+
+        async def process(i: int, company: CompanyData) -> None:
+            """Обрабатывает одну компанию, число одновременных запросов ограничено семафором"""
+            if limit_exceeded.is_set():
+                return
+
+            self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
+
             try:
-                # Проверяем на прерывание программы перед каждой компанией
-                try:
-                    # Используем asyncio.sleep с очень маленьким таймаутом для проверки прерываний
-                    await asyncio.sleep(0.01)
-                except asyncio.CancelledError:
-                    self.logger.info("Обнаружено прерывание, останавливаем парсинг")
-                    break
-                
-                self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
-                
-                # Соблюдаем задержку между запросами
-                await asyncio.sleep(self.rate_limit)
-                
-                # Парсим информацию о компании
-                try:
-                    result = await self.parse_company(company)
-                    if result:
-                        result.source = self.site_name
-                        results.append(result)
-                        self.logger.info(f"Успешно получены данные для {company.name}")
-                        
-                        # Обновляем результаты в data_manager если он доступен
-                        if data_manager:
-                            data_manager.update_results(result)
-                    else:
-                        self.logger.warning(f"Не удалось получить данные для {company.name}")
-                except ApiLimitExceeded as e:
+                result = await self.parse_company(company)
+                if result:
+                    result.source = self.site_name
+                    results.append(result)
+                    self.logger.info(f"Успешно получены данные для {company.name}")
+
+                    # Обновляем результаты в data_manager если он доступен
+                    if data_manager:
+                        data_manager.update_results(result)
+                else:
+                    self.logger.warning(f"Не удалось получить данные для {company.name}")
+            except ApiLimitExceeded as e:
+                # Сохраняем уже полученные результаты и прекращаем отправку новых запросов
+                if not limit_exceeded.is_set():
                     self.logger.warning(f"{e.message}. Прерываем дальнейшую обработку.")
-                    # Сохраняем уже полученные результаты и завершаем работу
-                    break
-                    
+                    limit_exceeded.set()
             except Exception as e:
                 self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
-        
+
+        # Обработка всех компаний параллельно в пределах семафора
+        try:
+            await asyncio.gather(*[process(i, company) for i, company in enumerate(companies)])
+        except asyncio.CancelledError:
+            self.logger.info("Обнаружено прерывание, останавливаем парсинг")
+
         # Выводим статистику по использованным запросам API
         used_requests = self.api_requests_count
         remaining_limit = max(0, self.api_daily_limit - used_requests)
@@ -678,98 +1112,117 @@ class CheckoParser(BaseSiteParser):
         :return: Обновленный объект с данными о компании или None в случае ошибки
         :raises ApiLimitExceeded: Если превышен лимит API запросов
         """
+        # Результат уже получен ранее - не расходуем запрос из дневного лимита
+        cached = self._get_cached_result(company.inn)
+        if cached is not None:
+            company.chairman_name, company.chairman_inn = cached
+            self.logger.info(f"Данные компании {company.inn} взяты из кэша")
+            return company
+
         # Проверяем, не превышен ли дневной лимит запросов
         if self.api_requests_count >= self.api_daily_limit:
             self.logger.warning(f"Превышен дневной лимит API запросов ({self.api_daily_limit}). Прерываем обработку.")
             raise ApiLimitExceeded(f"Превышен дневной лимит API запросов ({self.api_daily_limit})")
         
-        # Получаем API ключ
-        api_key = self.checko_keys.get_current_key()
-        if not api_key:
-            self.logger.error("Нет доступных API ключей Checko")
-            return None
-        
         try:
-            # Формируем URL для запроса по ИНН с API ключом
-            params = {
-                'key': api_key,
-                'inn': company.inn
-            }
-            
-            # Увеличиваем счетчик API запросов
-            if not self._increment_api_counter():
-                self.logger.warning(f"Превышен дневной лимит API запросов. Прерываем обработку.")
-                raise ApiLimitExceeded(f"Превышен дневной лимит API запросов ({self.api_daily_limit})")
+            session = await self._get_session()
             
-            async with aiohttp.ClientSession() as session:
-                # Выполняем прямой запрос к API
-                async with session.get(self.api_url, params=params, headers=self.headers) as response:
-                    if response.status != 200:
-                        self.logger.warning(f"Ошибка при запросе к API Checko для компании {company.inn}: статус {response.status}")
-                        
-                        # Обработка ошибок API
-                        if response.status == 403:  # Forbidden - проблема с API ключом
-                            self.logger.warning("Ошибка доступа (403). Проверьте правильность API ключа Checko")
-                            
-                            # Пробуем другой ключ, если есть
-                            if self.checko_keys.get_all_keys_count() > 1:
-                                self.logger.info("Пробуем другой API ключ Checko")
-                                self.checko_keys.rotate_key()
-                                # Пробуем снова с новым ключом
-                                return await self.parse_company(company)
-                            
-                            return None
-                            
-                        elif response.status == 429:  # Too Many Requests - превышен лимит запросов
-                            self.logger.warning("Превышен лимит запросов к API Checko.ru")
-                            raise ApiLimitExceeded("Превышен лимит запросов к API Checko.ru (статус 429)")
-                            
-                        elif response.status == 404:  # Not Found - компания не найдена
-                            self.logger.warning(f"Компания с ИНН {company.inn} не найдена в API Checko")
-                            company.chairman_name = "не найдено"
-                            company.chairman_inn = "не найдено"
-                            return company
-                            
-                        elif response.status >= 500:  # Серверная ошибка
-                            self.logger.error(f"Серверная ошибка API Checko (статус {response.status})")
-                            return None
-                            
-                        return None
+            # Ключ, отклоненный с 403, исключается из ротации для всех компаний, и запрос повторяется
+            # со следующим доступным ключом: параллельные запросы не переключают ключ повторно,
+            # а число попыток ограничено числом ключей
+            status = None
+            for _ in range(max(1, self.checko_keys.get_available_keys_count())):
+                # Получаем API ключ
+                api_key = self.checko_keys.get_available_key()
+                if not api_key:
+                    self.logger.error("Нет доступных API ключей Checko")
+                    return None
+                
+                # Формируем URL для запроса по ИНН с API ключом
+                params = {
+                    'key': api_key,
+                    'inn': company.inn
+                }
+                
+                # Увеличиваем счетчик API запросов (один раз на запрос, повторы после ошибок сервера не учитываются)
+                if not self._increment_api_counter():
+                    self.logger.warning(f"Превышен дневной лимит API запросов. Прерываем обработку.")
+                    raise ApiLimitExceeded(f"Превышен дневной лимит API запросов ({self.api_daily_limit})")
+                
+                # Сетевые ошибки и ответы 5xx повторяются с экспоненциальной задержкой (с учетом Retry-After)
+                async for attempt in self._retrying():
+                    with attempt:
+                        async with self._sem:
+                            # Соблюдаем частоту запросов (общую для всех слотов и повторных попыток)
+                            await self._rl.acquire()
+
+                            # Выполняем прямой запрос к API
+                            async with session.get(self.api_url, params=params, headers=self.headers) as response:
+                                status = response.status
+                                if status >= 500:
+                                    raise TransientHttpError(status, str(response.url), response.headers)
+                                # Получаем JSON ответ от API
+                                api_data = await response.json() if status == 200 else None
+                
+                if status != 403:  # Forbidden - проблема с API ключом
+                    break
+                
+                self.logger.warning("Ошибка доступа (403). Проверьте правильность API ключа Checko")
+                self.checko_keys.mark_failed(api_key, 403)
+                if self.checko_keys.get_available_keys_count():
+                    self.logger.info("Пробуем другой API ключ Checko")
+
+            if status != 200:
+                self.logger.warning(f"Ошибка при запросе к API Checko для компании {company.inn}: статус {status}")
+                
+                # Обработка ошибок API
+                if status == 429:  # Too Many Requests - превышен лимит запросов
+                    self.logger.warning("Превышен лимит запросов к API Checko.ru")
+                    raise ApiLimitExceeded("Превышен лимит запросов к API Checko.ru (статус 429)")
                     
-                    # Получаем JSON ответ от API
-                    api_data = await response.json()
-                    
-                    # Проверяем наличие данных в ответе
-                    if not api_data or 'data' not in api_data:
-                        self.logger.warning(f"Пустой ответ от API или отсутствуют данные для компании {company.inn}")
-                        return None
-                    
-                    # Проверяем, есть ли информация о руководителе
-                    if 'data' in api_data and 'Руковод' in api_data['data'] and api_data['data']['Руковод'] and len(api_data['data']['Руковод']) > 0:
-                        # Берем первого руководителя из списка
-                        head = api_data['data']['Руковод'][0]
-                        
-                        # Извлекаем имя руководителя
-                        if 'ФИО' in head:
-                            company.chairman_name = head['ФИО']
-                            self.logger.info(f"Извлечено имя директора: {company.chairman_name}")
-                        
-                        # Извлекаем ИНН руководителя
-                        if 'ИНН' in head:
-                            company.chairman_inn = head['ИНН']
-                            self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
-                        else:
-                            company.chairman_inn = "не найдено"
-                            self.logger.warning(f"ИНН директора не найден для компании {company.inn}")
-                        
-                        return company
-                    else:
-                        self.logger.warning(f"Информация о руководителе не найдена для компании {company.inn}")
-                        company.chairman_name = "не найдено"
-                        company.chairman_inn = "не найдено"
-                        return company
+                elif status == 404:  # Not Found - компания не найдена
+                    self.logger.warning(f"Компания с ИНН {company.inn} не найдена в API Checko")
+                    company.chairman_name = "не найдено"
+                    company.chairman_inn = "не найдено"
+                    return company
+
+                return None
+            
+            self.checko_keys.mark_succeeded(api_key)
+            
+            # Проверяем наличие данных в ответе
+            if not api_data or 'data' not in api_data:
+                self.logger.warning(f"Пустой ответ от API или отсутствуют данные для компании {company.inn}")
+                return None
+            
+            # Проверяем, есть ли информация о руководителе
+            if 'data' in api_data and 'Руковод' in api_data['data'] and api_data['data']['Руковод'] and len(api_data['data']['Руковод']) > 0:
+                # Берем первого руководителя из списка
+                head = api_data['data']['Руковод'][0]
+                
+                # Извлекаем имя руководителя
+                if 'ФИО' in head:
+                    company.chairman_name = head['ФИО']
+                    self.logger.info(f"Извлечено имя директора: {company.chairman_name}")
+                
+                # Извлекаем ИНН руководителя
+                if 'ИНН' in head:
+                    company.chairman_inn = head['ИНН']
+                    self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
+                else:
+                    company.chairman_inn = "не найдено"
+                    self.logger.warning(f"ИНН директора не найден для компании {company.inn}")
+            else:
+                self.logger.warning(f"Информация о руководителе не найдена для компании {company.inn}")
+                company.chairman_name = "не найдено"
+                company.chairman_inn = "не найдено"
+
+            self._cache_result(company)
+            return company
                         
-        except aiohttp.ClientError as e:
+        except ApiLimitExceeded:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, TransientHttpError) as e:
             self.logger.error(f"Ошибка сети при запросе к API Checko для компании {company.inn}: {e}")
         except json.JSONDecodeError as e:
             self.logger.error(f"Ошибка декодирования JSON из ответа API Checko: {e}")
@@ -778,26 +1231,6 @@ class CheckoParser(BaseSiteParser):
         
         return None
         
-    def _get_data_manager(self) -> Optional[DataManager]:
-        """
-        Получает объект DataManager из текущего экземпляра BaseSiteParser
-        через поиск в родительских объектах
-        
-        :return: Экземпляр DataManager или None
-        """
-        try:
-            # Получаем доступ к родительскому объекту ParserManager
-            frame = sys._getframe(2)
-            while frame:
-                if 'self' in frame.f_locals:
-                    parser_manager = frame.f_locals['self']
-                    if hasattr(parser_manager, 'data_manager'):
-                        return parser_manager.data_manager
-                frame = frame.f_back
-        except Exception as e:
-            self.logger.debug(f"Не удалось получить доступ к data_manager: {e}")
-        return None
-
     def _load_api_requests_counter(self) -> None:
         """
         Загружает информацию о количестве использованных запросов из кеша
@@ -859,99 +1292,104 @@ class CheckoParser(BaseSiteParser):
         
         return True
 
+# CSS-селекторы страниц zachestnyibiznes.ru
+_ZCB_COMPANY_LINK = 'a.card-title'
+_ZCB_COMPANY_LINK_MARKER = b'card-title'
+_ZCB_DIRECTOR_BLOCK = 'div.director-info'
+_ZCB_DIRECTOR_NAME = 'h2'
+_ZCB_DIRECTOR_INN = 'span.inn-value'
+
+# CSS-селекторы страниц companies.rbc.ru
+_RBC_COMPANY_LINK = 'a.company-name-link'
+_RBC_COMPANY_LINK_MARKER = b'company-name-link'
+_RBC_MANAGEMENT_BLOCK = 'div.company-management'
+_RBC_MANAGEMENT_NAME = 'span.management-name'
+
+# Подпись с должностью руководителя в начале строки ("Директор", "Генеральный директор" и т.п.,
+# с учетом регистра, чтобы не сработать на слово "директор" в тексте), ФИО в той же
+# или следующей строке и ИНН руководителя в пределах 300 символов после ФИО
+_PROFILE_RE = re.compile(
+    r'^[ \t]*(?P<role>Председатель|Директор|Руководитель'
+    r'|[А-ЯЁ][а-яё]+[ \t]+(?:председатель|директор|руководитель))[^\n]*?\s*'
+    r'(?P<name>[А-ЯЁ][а-яё]+(?:[ \t]+[А-ЯЁ][а-яё]+){1,2})'
+    r'(?:[\s\S]{0,300}?ИНН[:\s]*(?P<inn>\d{10,12}))?',
+    re.M
+)
+
+
+def _css_first(source, selector: str):
+    """
+    Возвращает первый элемент, соответствующий CSS-селектору
+    
+    :param source: HTML-код страницы или ранее найденный элемент
+    :param selector: CSS-селектор
+    :return: Найденный элемент или None
+    """
+    if isinstance(source, str):
+        source = LexborHTMLParser(source)
+    return source.css_first(selector)
+
+
+def _node_text(node) -> str:
+    """
+    Возвращает текст элемента без пробелов по краям за один проход.
+    Учитываются только собственные текстовые узлы элемента (deep=False): все селекторы,
+    для которых вызывается функция (h2, span.inn-value, span.management-name), указывают на листовые элементы
+    """
+    return node.text(deep=False, strip=True)
+
+
 class ZaChestnyiBiznesParser(BaseSiteParser):
     """Парсер для сайта zachestnyibiznes.ru"""
     
+    env_prefix = "ZACHESTNY"
+    
     def __init__(self, rate_limit: float = 3.0):
         super().__init__("zachestnyibiznes.ru", rate_limit)
         self.search_url = "https://zachestnyibiznes.ru/search"
     
+    def _extract_director(self, root, company: CompanyData) -> bool:
+        """
+        Извлекает данные руководителя со страницы компании или из выдачи поиска
+        
+        :param root: HTML-код или разобранная страница
+        :param company: Данные компании
+        :return: True, если блок с информацией о руководителе найден
+        """
+        # Ищем информацию о руководителе
+        director_block = _css_first(root, _ZCB_DIRECTOR_BLOCK)
+        if not director_block:
+            return False
+
+        # Извлекаем имя директора
+        director_name_elem = _css_first(director_block, _ZCB_DIRECTOR_NAME)
+        if director_name_elem:
+            company.chairman_name = _node_text(director_name_elem)
+
+        # Ищем ИНН директора
+        inn_elem = _css_first(director_block, _ZCB_DIRECTOR_INN)
+        if inn_elem:
+            company.chairman_inn = _node_text(inn_elem)
+        return True
+
     async def parse_company(self, company: CompanyData) -> Optional[CompanyData]:
         """Парсит информацию о председателе компании с сайта zachestnyibiznes.ru"""
-        max_attempts = 3
-        
-        for attempt in range(max_attempts):
-            try:
-                # Формируем URL для поиска по ИНН
-                params = {
-                    'query': company.inn
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    # Выполняем поисковый запрос
-                    async with session.get(self.search_url, params=params, headers=self.headers) as response:
-                        if response.status != 200:
-                            self.logger.warning(f"Ошибка при поиске компании {company.inn}: статус {response.status}")
-                            if attempt < max_attempts - 1 and response.status >= 500:
-                                await asyncio.sleep(2)
-                                continue
-                            return None
-                        
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Ищем ссылку на страницу компании
-                        company_link = soup.select_one('a.card-title')
-                        if not company_link:
-                            self.logger.warning(f"Компания {company.inn} не найдена на zachestnyibiznes.ru")
-                            return None
-                        
-                        company_href = company_link.get('href')
-                        if not company_href:
-                            return None
-                        
-                        company_url = f"https://zachestnyibiznes.ru{company_href}"
-                        
-                        # Переходим на страницу компании
-                        async with session.get(company_url, headers=self.headers) as company_response:
-                            if company_response.status != 200:
-                                self.logger.warning(f"Ошибка при получении данных компании {company.inn}: статус {company_response.status}")
-                                if attempt < max_attempts - 1 and company_response.status >= 500:
-                                    await asyncio.sleep(2)
-                                    continue
-                                return None
-                            
-                            company_html = await company_response.text()
-                            company_soup = BeautifulSoup(company_html, 'html.parser')
-                            
-                            # Ищем информацию о руководителе
-                            director_block = company_soup.select_one('div.director-info')
-                            if not director_block:
-                                self.logger.warning(f"Информация о руководителе компании {company.inn} не найдена")
-                                return None
-                            
-                            # Извлекаем имя директора
-                            director_name_elem = director_block.select_one('h2')
-                            if director_name_elem:
-                                company.chairman_name = director_name_elem.text.strip()
-                            
-                            # Ищем ИНН директора
-                            inn_elem = director_block.select_one('span.inn-value')
-                            if inn_elem:
-                                company.chairman_inn = inn_elem.text.strip()
-                            
-                            return company
-            except aiohttp.ClientError as e:
-                self.logger.error(f"Ошибка сети при парсинге компании {company.inn} на zachestnyibiznes.ru: {e}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2)
-                    continue
-            except Exception as e:
-                self.logger.error(f"Ошибка при парсинге компании {company.inn} на zachestnyibiznes.ru: {e}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2)
-                    continue
-        
-        return None
+        return await self._parse_company_via_search(
+            company, base_url="https://zachestnyibiznes.ru",
+            link_selector=_ZCB_COMPANY_LINK, link_marker=_ZCB_COMPANY_LINK_MARKER
+        )
 
 class AuditItParser(BaseSiteParser):
     """Парсер для сайта audit-it.ru"""
     
+    env_prefix = "AUDIT_IT"
+    
     def __init__(self, rate_limit: float = 2.0):
         """ Метод для инициализации класса """
-        super().__init__(rate_limit)
-        self.site_name = "www.audit-it.ru"
+        super().__init__("www.audit-it.ru", rate_limit)
         self.search_url = "https://www.audit-it.ru/contragent"
+        # Страница результатов поиска отдается сервером, поэтому сначала пробуем обойтись без браузера
+        self.http_search_url = "https://www.audit-it.ru/contragent/"
 
         # Настройка Chrome
         self.options = Options()
@@ -977,144 +1415,280 @@ class AuditItParser(BaseSiteParser):
         
         # Селекторы CSS классов
         self.table_class = "quick-profile"
+        # Текст страницы без результатов и признаки страницы проверки браузера (антибот)
+        self.not_found_text = "по вашему запросу ничего не найдено"
+        self.challenge_markers = ("captcha", "ddos-guard", "checking your browser", "проверка браузера")
+
         # Настройки таймаутов и ожидания
         self.page_load_timeout = 60  # Таймаут загрузки страницы (секунды)
         self.wait_timeout = 10  # Таймаут для ожидания элементов (секунды)
-        self.wait_after_search = 10  # Ожидание после поиска (секунды)
+        self.wait_after_search = 10  # Дополнительное время ожидания результатов поиска (секунды)
         
-        # Драйвер браузера (инициализируется в parse_companies)
-        self.driver = None
-        self.wait = None
-        self.current_retry = 0
+        # Пул браузеров (создается только при первой необходимости - если HTTP-запрос не дал результата)
+        self.pool_size = int(os.getenv('AUDIT_IT_POOL_SIZE', '2'))
+        self._pool: Optional[ChromeDriverPool] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
 
         self.max_retries = 1
 
 
     async def parse_companies(self, companies: List[CompanyData]) -> List[CompanyData]:
-        """Парсит список компаний с использованием одного экземпляра браузера"""
+        """Парсит список компаний параллельно: по HTTP, а при необходимости - в браузерах из пула"""
         results = []
         self.logger.info(f"Начинаем обработку {len(companies)} компаний")
+
+        # Получаем ссылку на data_manager для обновления результатов
+        data_manager = self._get_data_manager()
+
+        async def process(i: int, company: CompanyData) -> None:
+            """Обрабатывает одну компанию"""
+            try:
+                self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
+
+                result = await self.parse_company(company)
+                if result:
+                    result.source = self.site_name
+                    results.append(result)
+                    self.logger.info(f"Успешно получены данные для {company.name}")
+
+                    # Обновляем результаты в data_manager если он доступен
+                    if data_manager:
+                        data_manager.update_results(result)
+                else:
+                    self.logger.warning(f"Не удалось получить данные для {company.name}")
+            except Exception as e:
+                self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
+
+        # Обработка всех компаний параллельно: число HTTP-запросов ограничено семафором,
+        # число одновременно работающих браузеров - размером пула
+        try:
+            await asyncio.gather(*(process(i, company) for i, company in enumerate(companies)))
+        except asyncio.CancelledError:
+            self.logger.info("Обнаружено прерывание, останавливаем парсинг")
+
+        self.logger.info(f"Завершена обработка компаний, успешно: {len(results)} из {len(companies)}")
+        return results
+
+    async def parse_company(self, company: CompanyData) -> Optional[CompanyData]:
+        """
+        Парсит информацию о председателе компании с сайта www.audit-it.ru.
+        Сначала страница поиска запрашивается по HTTP; браузер используется, только если
+        сайт вернул страницу проверки (антибот) или ответ не удалось разобрать
+        """
+        # Результат уже получен ранее (в этом или предыдущем запуске)
+        cached = self._get_cached_result(company.inn)
+        if cached is not None:
+            company.chairman_name, company.chairman_inn = cached
+            self.logger.info(f"Данные компании {company.inn} взяты из кэша")
+            return company
+
+        # Соблюдаем частоту запросов: один раз на компанию, переход в браузер после HTTP-запроса
+        # не расходует еще один слот
+        await self._rl.acquire()
+
+        result = await self._parse_company_http(company)
+        if result is None:
+            result = await self._parse_company_in_browser(company)
+        if result is None:
+            # Временная ошибка (антибот, тайм-аут, сбой браузера) не кэшируется, чтобы повторить поиск позже
+            company.chairman_name = "не найдено"
+            company.chairman_inn = "не найдено"
+            return company
+        
+        # Кэшируем только окончательный ответ сайта: разобранный профиль или страницу "ничего не найдено"
+        self._cache_result(result)
+        return result
+
+    async def _parse_company_http(self, company: CompanyData) -> Optional[CompanyData]:
+        """
+        Получает информацию о председателе компании HTTP-запросом к странице поиска
         
+        :param company: Данные компании
+        :return: Данные компании или None, если нужно повторить поиск в браузере
+        """
         try:
-            # Инициализация браузера (один раз для всех компаний)
-            chromedriver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path = 'C:/chromedriver/chromedriver.exe'
-                if not os.path.exists(chromedriver_path):
-                    self.logger.error(f"ChromeDriver не найден по пути {chromedriver_path}")
-                    return results
-            
-            # Создаем сервис и драйвер
-            service = Service(executable_path=chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=self.options)
-            self.driver.set_page_load_timeout(self.page_load_timeout)
-            self.wait = WebDriverWait(self.driver, self.wait_timeout)
-            
-            # Получаем ссылку на data_manager для обновления результатов
-            data_manager = self._get_data_manager()
-            
-            # Обработка всех компаний
-            for i, company in enumerate(companies):
-                try:
-                    # Проверяем на прерывание программы перед каждой компанией
-                    try:
-                        
-                        await asyncio.sleep(0.01)
-                    except asyncio.CancelledError:
-                        self.logger.info("Обнаружено прерывание, останавливаем парсинг")
-                        break
-                    
-                    self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
-                    
-                    # Соблюдаем задержку между запросами
-                    await asyncio.sleep(self.rate_limit)
-                    
-                    # Сбрасываем счетчик попыток для новой компании
-                    self.current_retry = 0
-                    
-                    # Парсим информацию о компании (переиспользуя тот же браузер)
-                    result = await self.parse_company(company)
-                    if result:
-                        result.source = self.site_name
-                        results.append(result)
-                        self.logger.info(f"Успешно получены данные для {company.name}")
+            async with self._sem:
+                session = await self._get_session()
+                params = {
+                    'query': company.inn
+                }
+                async with session.get(self.http_search_url, params=params, headers=self.headers) as response:
+                    if response.status != 200:
+                        self.logger.info(f"Поиск компании {company.inn} по HTTP вернул статус {response.status}, используем браузер")
+                        return None
 
-                    else:
-                        self.logger.warning(f"Не удалось получить данные для {company.name}")
-                        
-                except Exception as e:
-                    self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
-            
-            self.logger.info(f"Завершена обработка компаний, успешно: {len(results)} из {len(companies)}")
+                    html = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"Ошибка сети при поиске компании {company.inn} по HTTP: {e}, используем браузер")
+            return None
+
+        profile = _css_first(html, f'.{self.table_class}')
+        if profile is not None:
+            self._apply_profile_text(company, profile.text(separator='\n'))
+            return company
+
+        page_text = html.lower()
+        if self.not_found_text in page_text:
+            self.logger.warning(f"Компания {company.inn} не найдена на www.audit-it.ru")
+            company.chairman_name = "не найдено"
+            company.chairman_inn = "не найдено"
+            return company
+
+        if any(marker in page_text for marker in self.challenge_markers):
+            self.logger.info(f"Сайт вернул страницу проверки для компании {company.inn}, используем браузер")
+        else:
+            self.logger.info(f"Блок {self.table_class} не найден в ответе для компании {company.inn}, используем браузер")
+        return None
+
+    def _apply_profile_text(self, company: CompanyData, company_text: str) -> None:
+        """
+        Извлекает данные о председателе из текста блока с информацией о компании
+        
+        :param company: Данные компании
+        :param company_text: Текст блока quick-profile
+        """
+        # Парсим данные о председателе одним проходом регулярного выражения:
+        # должность, ФИО в той же или следующей строке и ИНН неподалеку
+        match = _PROFILE_RE.search(company_text)
+        if match:
+            company.chairman_name = match.group('name')
+            self.logger.info(f"Извлечено имя директора: {company.chairman_name}")
             
-        except Exception as e:
-            self.logger.error(f"Ошибка при инициализации браузера: {e}")
-        finally:
-            # Гарантируем закрытие браузера в любом случае
-            self._ensure_browser_closed()
+            company.chairman_inn = match.group('inn') or "не найдено"
+            if match.group('inn'):
+                self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
+            else:
+                self.logger.warning(f"ИНН директора не найден для компании {company.inn}")
+        else:
+            self.logger.warning(f"Информация о директоре не найдена для компании {company.inn}")
+            company.chairman_name = "не найдено"
+            company.chairman_inn = "не найдено"
+
+    async def _get_pool(self) -> Optional[ChromeDriverPool]:
+        """
+        Возвращает запущенный пул браузеров, создавая его при первом обращении
         
-        return results
-    
-    async def parse_company(self, company: CompanyData) -> Optional[CompanyData]:
-        """Парсит информацию о председателе компании с сайта www.audit-it.ru"""
+        :return: Пул браузеров или None, если браузер запустить не удалось
+        """
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+
+        async with self._pool_lock:
+            try:
+                # Запуск пула браузеров (один раз, браузеры переиспользуются между вызовами)
+                if self._pool is None:
+                    chromedriver_path = _resolve_chromedriver_path()
+                    if chromedriver_path is None:
+                        self.logger.error("ChromeDriver не найден")
+                        return None
+
+                    self._pool = ChromeDriverPool(
+                        chromedriver_path,
+                        self.options,
+                        size=self.pool_size,
+                        page_load_timeout=self.page_load_timeout,
+                        wait_timeout=self.wait_timeout,
+                        name=f"{self.site_name}.ChromeDriverPool"
+                    )
+                await self._pool.start()
+            except Exception as e:
+                self.logger.error(f"Ошибка при инициализации браузера: {e}")
+                return None
+
+        return self._pool
+
+    async def _parse_company_in_browser(self, company: CompanyData) -> Optional[CompanyData]:
+        """
+        Парсит информацию о председателе компании с сайта www.audit-it.ru в браузере из пула
+        
+        :param company: Данные компании
+        :return: Данные компании или None, если окончательный ответ сайта получить не удалось
+        """
+        pool = await self._get_pool()
+        if pool is None:
+            return None
+
+        item = await pool.acquire()
+        try:
+            driver, wait = item
+            result = await pool.run(self._parse_company_sync, company, driver, wait)
+
+            # Если процесс chromedriver завершился, заменяем браузер новым
+            process = driver.service.process
+            if process is None or process.poll() is not None:
+                self.logger.warning("Браузер перестал отвечать, перезапускаем")
+                # При неудачном перезапуске закрытый браузер уже удален из пула - возвращать нечего
+                item = await pool.recreate(item)
+
+            return result
+        finally:
+            if item is not None:
+                pool.release(item)
+
+    def _parse_company_sync(self, company: CompanyData, driver: webdriver.Chrome, wait: WebDriverWait) -> Optional[CompanyData]:
+        """
+        Синхронно парсит информацию о председателе компании в указанном браузере
+        (выполняется в пуле потоков браузеров)
+
+        :param company: Данные компании
+        :param driver: Драйвер браузера из пула
+        :param wait: Объект ожидания для драйвера
+        :return: Данные компании или None, если окончательный ответ сайта получить не удалось
+        """
         
         for attempt in range(self.max_retries):
             try:
                 # Открываем страницу поиска
                 self.logger.info(f"Открываем страницу поиска для компании {company.inn} (попытка {attempt+1}/{self.max_retries})")
-                self.driver.get(self.search_url)
+                driver.get(self.search_url)
                 
                 # Проверка на некорректный URL (data: и др.)
-                if self.driver.current_url.startswith('data.;') or not self.driver.current_url.startswith('http'):
-                    self.logger.error(f"Браузер вернул некорректный URL: {self.driver.current_url}")
+                if driver.current_url.startswith('data.;') or not driver.current_url.startswith('http'):
+                    self.logger.error(f"Браузер вернул некорректный URL: {driver.current_url}")
                     if attempt < self.max_retries - 1:
-                        await asyncio.sleep(2)
+                        time.sleep(2)
                         # Пробуем обновить страницу
                         try:
-                            self.driver.refresh()
-                            await asyncio.sleep(3)  # Ждем после обновления
+                            driver.refresh()
+                            time.sleep(3)  # Ждем после обновления
                         except:
                             pass
                         continue
                     else:
-                        # Возвращаем данные с отметкой "не найдено"
-                        company.chairman_name = "не найдено"
-                        company.chairman_inn = "не найдено"
-                        return company
+                        # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                        return None
 
                 
                 # Ждем загрузки поля поиска
                 try:
-                    search_input = self.wait.until(EC.presence_of_element_located((By.XPATH, self.search_input_xpath)))
+                    search_input = wait.until(EC.presence_of_element_located((By.XPATH, self.search_input_xpath)))
                 except TimeoutException:
                     self.logger.warning(f"Тайм-аут при ожидании элемента поиска (попытка {attempt+1}/{self.max_retries})")
                     if attempt < self.max_retries - 1:
-                        await asyncio.sleep(2)
+                        time.sleep(2)
                         continue
                     else:
-                        # Возвращаем данные с отметкой "не найдено"
-                        company.chairman_name = "не найдено"
-                        company.chairman_inn = "не найдено"
-                        return company
+                        # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                        return None
                 
                 # Вводим ИНН в поле поиска
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", search_input)
-                self.driver.execute_script("arguments[0].focus();", search_input)
-                self.driver.execute_script("arguments[0].click();", search_input)
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", search_input)
+                driver.execute_script("arguments[0].focus();", search_input)
+                driver.execute_script("arguments[0].click();", search_input)
                 try:
-                    actions = webdriver.ActionChains(self.driver)
+                    actions = webdriver.ActionChains(driver)
                     import random
 
                     actions.move_to_element_with_offset(search_input, random.randint(1, 5), random.randint(1, 5))
-                    await asyncio.sleep(1)
+                    time.sleep(1)
                     search_input.send_keys(Keys.ENTER)
-                    await asyncio.sleep(2)
+                    time.sleep(2)
                     actions.perform()
 
                     search_input.clear()
                     search_input.send_keys(company.inn)
                 except Exception:
-                    self.driver.execute_script("""
+                    driver.execute_script("""
                         const input = arguments[0];
                         const value = arguments[1];
                         input.value = value;
@@ -1124,21 +1698,27 @@ class AuditItParser(BaseSiteParser):
                 
                 # Нажимаем кнопку поиска или Enter
                 try:
-                    search_button = self.driver.find_element(By.XPATH, self.search_button_xpath)
+                    search_button = driver.find_element(By.XPATH, self.search_button_xpath)
                     search_button.click()
                 except NoSuchElementException:
                     search_input.send_keys(Keys.RETURN)
                 
                 # Ждем загрузки результатов поиска
                 try:
-                    # Ждем появления страницы компании или страницы "ничего не найдено"
-                    self.wait.until(lambda d: 'контрагент' in d.page_source.lower())
-                    
-                    # Даем странице дополнительное время загрузиться (особенно важно для директора)
-                    await asyncio.sleep(self.wait_after_search)
+                    # Ждем появления блока с информацией о компании или страницы "ничего не найдено"
+                    # вместо фиксированной паузы после поиска
+                    WebDriverWait(
+                        driver,
+                        self.wait_timeout + self.wait_after_search,
+                        poll_frequency=0.2,
+                        ignored_exceptions=(StaleElementReferenceException,)
+                    ).until(
+                        lambda d: d.find_elements(By.CLASS_NAME, self.table_class)
+                        or self.not_found_text in d.page_source.lower()
+                    )
                     
                     # Если мы на странице "ничего не найдено"
-                    if 'по вашему запросу ничего не найдено' in self.driver.page_source.lower():
+                    if self.not_found_text in driver.page_source.lower():
                         self.logger.warning(f"Компания {company.inn} не найдена на www.audit-it.ru")
                         # Возвращаем данные с отметкой "не найдено"
                         company.chairman_name = "не найдено"
@@ -1149,230 +1729,139 @@ class AuditItParser(BaseSiteParser):
                     try:
                         # Ищем блок с информацией по классу quick-profile
                         self.logger.info(f"Получаем информацию о компании из блока {self.table_class}")
-                        table_elem = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, self.table_class)))
-                        
-                        # Получаем весь текст
-                        company_text = table_elem.text
-                        
-                        # TODO Парсим данные о председателе
-                        # Шаг 1: Ищем строку с упоминанием "Председатель" или "Директор"
-                        chairman_line = None
-                        lines = company_text.split('\n')
-                        for i, line in enumerate(lines):
-                            if "Председатель" in line or "Директор" in line or "руководитель" in line:
-                                chairman_line = i
-                                break
-                        
-                        if chairman_line is not None:
-                            # Шаг 2: Имя директора обычно на следующей строке после должности
-                            if chairman_line + 1 < len(lines):
-                                chairman_name = lines[chairman_line + 1].strip()
-                                # Проверяем, что это похоже на ФИО (начинается с заглавной буквы и содержит пробелы)
-                                if chairman_name and chairman_name[0].isupper() and ' ' in chairman_name:
-                                    company.chairman_name = chairman_name
-                                    self.logger.info(f"Извлечено имя директора: {chairman_name}")
-                                else:
-                                    # Если имя не в следующей строке, то возможно оно в той же строке
-                                    name_parts = [word for word in lines[chairman_line].split() if word[0].isupper() and len(word) > 1]
-                                    if len(name_parts) >= 2:  # Минимум имя и фамилия
-                                        # Пропускаем слово "Председатель"/"Директор"
-                                        if name_parts[0] in ["Председатель", "Директор"]:
-                                            name_parts = name_parts[1:]
-                                        
-                                        if name_parts:
-                                            company.chairman_name = " ".join(name_parts)
-                                            self.logger.info(f"Извлечено имя директора из строки должности: {company.chairman_name}")
-                        
-                            # Шаг 3: Ищем ИНН директора (обычно в следующих 3-5 строках)
-                            for j in range(chairman_line, min(chairman_line + 5, len(lines))):
-                                inn_match = self.chairman_inn_pattern.search(lines[j])
-                                if inn_match:
-                                    company.chairman_inn = inn_match.group(1)
-                                    self.logger.info(f"Извлечен ИНН директора: {company.chairman_inn}")
-                                    break
-                        
-                            if not company.chairman_inn:
-                                self.logger.warning(f"ИНН директора не найден для компании {company.inn}")
-                                company.chairman_inn = "не найдено"
-                        else:
-                            self.logger.warning(f"Информация о директоре не найдена для компании {company.inn}")
-                            company.chairman_name = "не найдено"
-                            company.chairman_inn = "не найдено"
+                        table_elem = wait.until(EC.presence_of_element_located((By.CLASS_NAME, self.table_class)))
                         
+                        # Получаем весь текст и извлекаем из него данные о председателе
+                        self._apply_profile_text(company, table_elem.text)
                         return company
                         
                     except StaleElementReferenceException:
                         if attempt < self.max_retries - 1:
                             self.logger.warning(f"Элемент устарел, повторяем попытку ({attempt+1}/{self.max_retries})")
-                            await asyncio.sleep(2)
+                            time.sleep(2)
                             continue
                         raise
                     except Exception as e:
                         self.logger.error(f"Ошибка при извлечении данных о компании: {e}")
                         if attempt < self.max_retries - 1:
-                            await asyncio.sleep(2)
+                            time.sleep(2)
                             continue
-                        # Возвращаем данные с отметкой "не найдено"
-                        company.chairman_name = "не найдено"
-                        company.chairman_inn = "не найдено"
-                        return company
+                        # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                        return None
                     
                 except TimeoutException:
                     self.logger.warning(f"Тайм-аут при получении данных для компании {company.inn}")
                     if attempt < self.max_retries - 1:
-                        await asyncio.sleep(2)
+                        time.sleep(2)
                         continue
-                    # Возвращаем данные с отметкой "не найдено"
-                    company.chairman_name = "не найдено"
-                    company.chairman_inn = "не найдено"
-                    return company
+                    # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                    return None
                     
             except WebDriverException as e:
                 self.logger.error(f"Ошибка веб-драйвера при парсинге компании {company.inn}: {e}")
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(2)
+                    time.sleep(2)
                     continue
-                # Возвращаем данные с отметкой "не найдено"
-                company.chairman_name = "не найдено"
-                company.chairman_inn = "не найдено"
-                return company
+                # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                return None
             except Exception as e:
                 self.logger.error(f"Ошибка при парсинге компании {company.inn}: {e}")
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(2)
+                    time.sleep(2)
                     continue
-                # Возвращаем данные с отметкой "не найдено"
-                company.chairman_name = "не найдено"
-                company.chairman_inn = "не найдено"
-                return company
+                # Временная ошибка (тайм-аут, сбой браузера) - не окончательный ответ сайта
+                return None
         
         # Если все попытки не удались
-        company.chairman_name = "не найдено"
-        company.chairman_inn = "не найдено"
-        return company
+        return None
 
-    def _get_data_manager(self) -> Optional[DataManager]:
-        """
-        Получает объект DataManager из текущего экземпляра BaseSiteParser
-        через поиск в родительских объектах
-        
-        :return: Экземпляр DataManager или None
-        """
-        try:
-            # Получаем доступ к родительскому объекту ParserManager
-            frame = sys._getframe(2)
-            while frame:
-                if 'self' in frame.f_locals:
-                    parser_manager = frame.f_locals['self']
-                    if hasattr(parser_manager, 'data_manager'):
-                        return parser_manager.data_manager
-                frame = frame.f_back
-        except Exception as e:
-            self.logger.debug(f"Не удалось получить доступ к data_manager: {e}")
-        return None 
+    async def close(self) -> None:
+        """Закрывает браузеры пула и HTTP-сессию"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        await super().close()
 
-    def _ensure_browser_closed(self) -> None:
-        """
-        Надежное закрытие браузера
-        """
-        if self.driver:
-            try:
-                self.logger.info("Закрываем браузер...")
-                # Закрываем браузер стандартным способом
-                self.driver.quit()
-                self.logger.info("Браузер успешно закрыт")
-            except Exception as e:
-                self.logger.error(f"Ошибка при закрытии браузера: {e}")
-            finally:
-                # Гарантируем, что ссылки на драйвер сбрасываются в любом случае
-                self.driver = None
-                self.wait = None
 
 class RbcCompaniesParser(BaseSiteParser):
     """Парсер для сайта companies.rbc.ru"""
     
+    env_prefix = "RBC"
+    
     def __init__(self, rate_limit: float = 2.0):
         super().__init__("companies.rbc.ru", rate_limit)
         self.search_url = "https://companies.rbc.ru/search/"
     
+    def _extract_director(self, root, company: CompanyData) -> bool:
+        """
+        Извлекает данные руководителя со страницы компании или из карточки в выдаче поиска
+        
+        :param root: HTML-код или разобранная страница
+        :param company: Данные компании
+        :return: True, если блок с информацией о руководителе найден
+        """
+        # Ищем информацию о руководителе
+        director_section = _css_first(root, _RBC_MANAGEMENT_BLOCK)
+        if not director_section:
+            return False
+
+        # Извлекаем имя директора
+        director_name_elem = _css_first(director_section, _RBC_MANAGEMENT_NAME)
+        if director_name_elem:
+            company.chairman_name = _node_text(director_name_elem)
+
+        # ИНН директора обычно не представлен на странице companies.rbc.ru
+        return True
+
     async def parse_company(self, company: CompanyData) -> Optional[CompanyData]:
         """Парсит информацию о председателе компании с сайта companies.rbc.ru"""
-        max_attempts = 3
-        
-        for attempt in range(max_attempts):
-            try:
-                # Формируем URL для поиска по ИНН
-                params = {
-                    'query': company.inn
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    # Выполняем поисковый запрос
-                    async with session.get(self.search_url, params=params, headers=self.headers) as response:
-                        if response.status != 200:
-                            self.logger.warning(f"Ошибка при поиске компании {company.inn}: статус {response.status}")
-                            if attempt < max_attempts - 1 and response.status >= 500:
-                                await asyncio.sleep(2)
-                                continue
-                            return None
-                        
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Ищем ссылку на страницу компании
-                        company_link = soup.select_one('a.company-name-link')
-                        if not company_link:
-                            self.logger.warning(f"Компания {company.inn} не найдена на companies.rbc.ru")
-                            return None
-                        
-                        company_href = company_link.get('href')
-                        if not company_href:
-                            return None
-                        
-                        company_url = f"https://companies.rbc.ru{company_href}"
-                        
-                        # Переходим на страницу компании
-                        async with session.get(company_url, headers=self.headers) as company_response:
-                            if company_response.status != 200:
-                                self.logger.warning(f"Ошибка при получении данных компании {company.inn}: статус {company_response.status}")
-                                if attempt < max_attempts - 1 and company_response.status >= 500:
-                                    await asyncio.sleep(2)
-                                    continue
-                                return None
-                            
-                            company_html = await company_response.text()
-                            company_soup = BeautifulSoup(company_html, 'html.parser')
-                            
-                            # Ищем информацию о руководителе
-                            director_section = company_soup.select_one('div.company-management')
-                            if not director_section:
-                                self.logger.warning(f"Информация о руководителе компании {company.inn} не найдена")
-                                return None
-                            
-                            # Извлекаем имя директора
-                            director_name_elem = director_section.select_one('span.management-name')
-                            if director_name_elem:
-                                company.chairman_name = director_name_elem.text.strip()
-                            
-                            # ИНН директора обычно не представлен на странице companies.rbc.ru
-                            
-                            return company
-            except aiohttp.ClientError as e:
-                self.logger.error(f"Ошибка сети при парсинге компании {company.inn} на companies.rbc.ru: {e}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2)
-                    continue
-            except Exception as e:
-                self.logger.error(f"Ошибка при парсинге компании {company.inn} на companies.rbc.ru: {e}")
-                if attempt < max_attempts - 1:
-                    await asyncio.sleep(2)
-                    continue
-        
-        return None
+        return await self._parse_company_via_search(
+            company, base_url="https://companies.rbc.ru",
+            link_selector=_RBC_COMPANY_LINK, link_marker=_RBC_COMPANY_LINK_MARKER
+        )
+
+
+# ИНН физического (12 цифр) и юридического (10 цифр) лица в подсказках сайта Райффайзен банка
+_INN12_RE = re.compile(r'\d{12}')
+_INN10_RE = re.compile(r'\d{10}')
+
+# Статусы ответа API Dadata, означающие ошибку в самом запросе (повторится с любым ключом)
+_DADATA_REJECTED_STATUSES = (400, 404, 422)
+
+# Должности руководителя в списке managers ответа Dadata (в нижнем регистре)
+_CHAIR_TITLES = ('председатель', 'директор', 'руководитель')
+
+# Способы поиска поля ввода ФИО на сайте Райффайзен банка (в порядке проверки)
+_RAIFFEISEN_INPUT_LOCATORS = (
+    (By.XPATH, "/html/body/div[1]/div[3]/div/div[2]/div[14]/div[2]/div/div/div/div/form/div[1]/div[1]/div/div/div[1]/div/div/div/div[1]/div[1]/input"),
+    (By.ID, "party"),
+    (By.NAME, "party"),
+)
+
+# Запросы, которые браузер не выполняет на сайте Райффайзен банка: для поиска нужны
+# только поле ввода и автоподсказки, а счетчики и картинки лишь замедляют загрузку
+_RAIFFEISEN_BLOCKED_URLS = [
+    "*.doubleclick.net/*",
+    "*.google-analytics.com/*",
+    "*.googletagmanager.com/*",
+    "*mc.yandex.ru/*",
+    "*yandex.ru/metrika/*",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.webp",
+    "*.woff",
+    "*.woff2",
+]
+
 
 class DadataParser(BaseSiteParser):
     """Парсер для получения информации о компаниях через API dadata.ru"""
     
+    env_prefix = "DADATA"
+    
     def __init__(self, token: str, rate_limit: float = 0.2):
         """
         Инициализация клиента Dadata
@@ -1389,6 +1878,7 @@ class DadataParser(BaseSiteParser):
             
         self.dadata_keys = KeyRotator(dadata_keys, "dadata.ru")
         self.primary_token = token  # Сохраняем первичный токен
+        self.find_party_url = "https://suggestions.dadata.ru/suggestions/api/4_1/rs/findById/party"
 
         # Настройка Chrome
         self.options = Options()
@@ -1398,6 +1888,9 @@ class DadataParser(BaseSiteParser):
         self.options.add_argument('--ignore-certificate-errors')
         self.options.add_argument('--ignore-ssl-errors')
         self.options.add_argument('--log-level=3')  # Уменьшаем вывод логов браузера
+        # Не ждем полной загрузки страницы (картинок, счетчиков): поле поиска доступно после построения DOM
+        self.options.page_load_strategy = 'eager'
+        self.options.add_experimental_option('prefs', {"profile.managed_default_content_settings.images": 2})
         
         # Загрузка параметров из .env
         self.page_load_timeout = int(os.getenv('PAGE_LOAD_TIMEOUT_SECONDS', '90'))
@@ -1405,15 +1898,37 @@ class DadataParser(BaseSiteParser):
         self.autocomplete_wait_seconds = int(os.getenv('AUTOCOMPLETE_WAIT_SECONDS', '5'))
         self.max_key_attempts = int(os.getenv('MAX_KEY_ATTEMPTS', '3'))
         self.raiffeisen_max_retry_attempts = int(os.getenv('RAIFFEISEN_MAX_RETRY_ATTEMPTS', '24'))
-        
-        self.dadata = None  # Инициализируется в parse_companies
-        self.failed_key_attempts = {}  # Словарь для отслеживания неудачных попыток по ключам
+        # Количество ИНН, запрашиваемых в API одновременно (одной пачкой)
+        self.batch_size = max(1, int(os.getenv('DADATA_BATCH_SIZE', '20')))
+        # Время жизни результатов в дисковом кэше (руководители меняются редко, по умолчанию 30 дней)
+        self.cache_ttl = int(os.getenv('DADATA_CACHE_TTL', str(30 * 24 * 3600)))
+
+        self.token: Optional[str] = None  # Ключ, с которым выполняются запросы (выбирается при первом запросе)
+        self.failed_key_attempts: Counter = Counter()  # Счетчик неудачных попыток по ключам
+        self._headers_by_key: Dict[str, Dict[str, str]] = {}  # Заголовки авторизации по ключам (создаются один раз на ключ)
+        self._http: Optional[httpx.AsyncClient] = None  # Общий HTTP-клиент для всех ключей (создается лениво)
+        self._rot_lock: Optional[asyncio.Lock] = None  # Блокировка ротации ключей (создается в цикле событий)
         self.force_token = None  # Токен, который будет использоваться принудительно в этом экземпляре
         self.ignore_force_token_temporarily = False  # Флаг для временного игнорирования принудительного токена
+        # Запросы к API по ИНН в текущем запуске: дубликаты ИНН ждут уже начатый запрос (ИНН -> организации)
+        self._inn_cache: Dict[str, asyncio.Future] = {}
+        # Найденные на сайте Райффайзен банка ИНН руководителей в текущем запуске (ФИО -> ИНН)
+        self._chairman_inn_cache: Dict[str, asyncio.Future] = {}
+        # ИНН, которые API отклонило в текущем запуске (см. _DADATA_REJECTED_STATUSES):
+        # повторные запросы по ним (с другими ключами и для дубликатов) до конца запуска не выполняются
+        self._permanent_fail: Set[str] = set()
 
-        self.driver = None
-        self.wait = None
-        self.current_retry = 0
+        # Пул браузеров для поиска ИНН руководителя на сайте Райффайзен банка
+        # (создается при первом обращении и переиспользуется между вызовами parse_companies)
+        self.pool_size = int(os.getenv('RAIFFEISEN_POOL_SIZE', '2'))
+        self._pool: Optional[ChromeDriverPool] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        # Индекс способа поиска поля ввода, сработавшего последним (проверяется первым)
+        self._input_locator_idx = 0
+        # Событие появления токена в ведре Райффайзен банка и таймер, который его установит
+        # (создаются в цикле событий при первой блокировке)
+        self._raiffeisen_available: Optional[asyncio.Event] = None
+        self._raiffeisen_timer: Optional[asyncio.TimerHandle] = None
 
     def set_specific_token(self, token: str) -> None:
         """
@@ -1432,68 +1947,157 @@ class DadataParser(BaseSiteParser):
         self.ignore_force_token_temporarily = True
         self.logger.warning(f"Временно игнорируем принудительно установленный токен из-за ошибки")
     
-    def _load_api_keys_from_env(self, env_prefix: str) -> List[str]:
-        """
-        Загружает API ключи из переменных окружения с указанным префиксом
-        
-        :param env_prefix: Префикс для переменных окружения (например, 'DADATA_TOKEN')
-        :return: Список найденных ключей
-        """
-        keys = []
-        # Ищем основной ключ
-        main_key = os.getenv(env_prefix)
-        if main_key:
-            keys.append(main_key)
-        
-        # Ищем дополнительные ключи с номерами (DADATA_TOKEN_1, DADATA_TOKEN_2, и т.д.)
-        i = 1
-        while True:
-            key = os.getenv(f"{env_prefix}_{i}")
-            if not key:
-                break
-            keys.append(key)
-            i += 1
-        
-        self.logger.info(f"Загружено {len(keys)} ключей с префиксом {env_prefix}")
-        return keys
-    
-    async def _create_dadata_client(self) -> Optional[DadataAsync]:
+    def _get_active_token(self) -> Optional[str]:
         """
-        Создает новый клиент Dadata с текущим активным ключом
+        Возвращает ключ, с которым выполняются запросы к API
         
-        :return: DadataAsync клиент или None в случае ошибки
+        :return: API ключ или None, если ключей нет
         """
         # Если установлен принудительный токен и не нужно его игнорировать, используем его
         if self.force_token and not self.ignore_force_token_temporarily:
             token = self.force_token
-            self.logger.info(f"Используется принудительно установленный токен")
         else:
-            token = self.dadata_keys.get_current_key()
+            # Ключи, исключенные из ротации после ошибок, пропускаются
+            token = self.dadata_keys.get_available_key()
             
         if not token:
             self.logger.error("Нет доступных API ключей Dadata")
             return None
+        return token
+    
+    def _auth_headers(self, token: str) -> Dict[str, str]:
+        """
+        Возвращает заголовки запроса к API для ключа (создаются один раз на ключ;
+        смена ключа - только смена заголовков, соединения общего клиента сохраняются)
+        
+        :param token: API ключ
+        :return: Заголовки запроса
+        """
+        headers = self._headers_by_key.get(token)
+        if headers is None:
+            headers = self._headers_by_key[token] = {
+                'Authorization': f'Token {token}',
+                'Content-Type': 'application/json',
+                'Accept': 'application/json',
+            }
+        return headers
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Возвращает общий HTTP-клиент парсера (HTTP/2, пул соединений), создавая его при первом обращении
         
+        :return: Экземпляр httpx.AsyncClient
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=10,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._http
+    
+    async def _find_party(self, token: str, inn: str) -> List[Dict[str, Any]]:
+        """
+        Ищет организацию по ИНН методом findById/party
+        
+        :param token: API ключ
+        :param inn: ИНН организации
+        :return: Список найденных организаций (suggestions)
+        :raises httpx.HTTPStatusError: Если API вернуло ошибку
+        """
+        response = await self._get_http().post(self.find_party_url, json={'query': inn}, headers=self._auth_headers(token))
+        response.raise_for_status()
+        return _loads_json(response.content)['suggestions']
+    
+    def _get_rot_lock(self) -> asyncio.Lock:
+        """Возвращает блокировку ротации ключей, создавая ее при первом обращении"""
+        if self._rot_lock is None:
+            self._rot_lock = asyncio.Lock()
+        return self._rot_lock
+    
+    async def _get_pool(self) -> Optional[ChromeDriverPool]:
+        """
+        Возвращает запущенный пул браузеров, создавая его при первом обращении
+        
+        :return: Пул браузеров или None, если браузер запустить не удалось
+        """
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        
+        async with self._pool_lock:
+            try:
+                if self._pool is None:
+                    # Путь к ChromeDriver с учетом операционной системы
+                    chromedriver_path = _resolve_chromedriver_path()
+                    if chromedriver_path is None:
+                        self.logger.error("ChromeDriver не найден")
+                        return None
+                    
+                    self.logger.info(f"Используется ChromeDriver по пути: {chromedriver_path}")
+                    self._pool = ChromeDriverPool(
+                        chromedriver_path,
+                        self.options,
+                        size=self.pool_size,
+                        page_load_timeout=self.page_load_timeout,
+                        wait_timeout=self.element_wait_timeout,
+                        on_create=self._setup_driver,
+                        name=f"{self.site_name}.ChromeDriverPool"
+                    )
+                await self._pool.start()
+            except Exception as e:
+                self.logger.error(f"Ошибка при инициализации браузера: {e}")
+                return None
+        
+        return self._pool
+    
+    def _setup_driver(self, driver: webdriver.Chrome) -> None:
+        """
+        Отключает в новом браузере загрузку ненужных для поиска ресурсов
+        (выполняется в пуле потоков браузеров при создании браузера)
+        
+        :param driver: Драйвер браузера
+        """
         try:
-            return DadataAsync(token)
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _RAIFFEISEN_BLOCKED_URLS})
         except Exception as e:
-            self.logger.error(f"Ошибка при создании клиента Dadata: {e}")
-            return None
-            
-    async def _rotate_dadata_client(self) -> Optional[DadataAsync]:
+            self.logger.warning(f"Не удалось отключить загрузку лишних ресурсов в браузере: {e}")
+    
+    async def _close_http(self) -> None:
+        """
+        Закрывает общий HTTP-клиент, не дольше 2 секунд. Ошибки закрытия только логируются,
+        отмена задачи (например, по Ctrl+C) пробрасывается дальше
         """
-        Переключает на следующий API ключ и создает новый клиент
+        http, self._http = self._http, None
+        self.token = None
+        if http is None:
+            return
+        try:
+            await asyncio.wait_for(http.aclose(), timeout=2)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.debug(f"Ошибка при закрытии HTTP-клиента Dadata: {e}")
+    
+    def _switch_key(self, failed_key: Optional[str]) -> Optional[str]:
+        """
+        Переключается со сбойного ключа на следующий (вызывается под блокировкой ротации).
+        Если ключ уже сменила другая задача, повторно не ротирует, а возвращает текущий ключ
         
-        :return: Новый DadataAsync клиент или None в случае ошибки
+        :param failed_key: Ключ, с которым запрос завершился ошибкой
+        :return: API ключ или None в случае ошибки
         """
-        # Закрываем текущий клиент, если он существует
-        if self.dadata:
-            try:
-                await self.dadata.close()
-            except:
-                pass
-            self.dadata = None
+        token = self._get_active_token()
+        if failed_key != token:
+            return token
+        return self._rotate_token()
+    
+    def _rotate_token(self) -> Optional[str]:
+        """
+        Переключает на следующий API ключ
         
+        :return: Новый API ключ или None в случае ошибки
+        """
         # Если установлен принудительный токен и не нужно его игнорировать, всегда используем его
         if self.force_token and not self.ignore_force_token_temporarily:
             token = self.force_token
@@ -1505,103 +2109,207 @@ class DadataParser(BaseSiteParser):
         if not token:
             self.logger.error("Нет доступных API ключей Dadata для ротации")
             return None
+        return token
+    
+    async def _memoized(self, cache: Dict[str, asyncio.Future], key: str, factory: Callable) -> Any:
+        """
+        Выполняет запрос один раз на ключ: одновременные и последующие вызовы с тем же ключом
+        получают результат уже начатого запроса. Неудачный запрос из кэша удаляется,
+        чтобы следующий вызов повторил его (например, с другим API ключом)
+        
+        :param cache: Кэш запросов (ключ -> Future)
+        :param key: Ключ запроса
+        :param factory: Функция без аргументов, возвращающая корутину запроса
+        :return: Результат запроса
+        """
+        fut = cache.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
         
-        # Создаем новый клиент
+        fut = cache[key] = asyncio.get_running_loop().create_future()
         try:
-            return DadataAsync(token)
+            result = await factory()
+        except asyncio.CancelledError:
+            cache.pop(key, None)
+            fut.cancel()
+            raise
         except Exception as e:
-            self.logger.error(f"Ошибка при создании клиента Dadata с новым ключом: {e}")
-            return None
+            cache.pop(key, None)
+            fut.set_exception(e)
+            # Ошибку получает вызывающий код; ожидающие дубликаты получат ее из Future
+            fut.exception()
+            raise
+        fut.set_result(result)
+        return result
     
+    async def _find_party_cached(self, token: str, inn: str) -> List[Dict[str, Any]]:
+        """
+        Ищет организацию по ИНН с соблюдением частоты запросов, не повторяя запрос для дубликатов ИНН
+        
+        :param token: API ключ
+        :param inn: ИНН организации
+        :return: Список найденных организаций (suggestions)
+        """
+        async def request() -> List[Dict[str, Any]]:
+            async with self._sem:
+                # Соблюдаем частоту запросов
+                await self._rl.acquire()
+                return await self._find_party(token, inn)
+        
+        return await self._memoized(self._inn_cache, inn, request)
+    
+    async def _get_chairman_inn_cached(self, full_name: str) -> Optional[str]:
+        """
+        Получает ИНН руководителя через сайт Райффайзен банка один раз на ФИО
+        (безуспешный поиск в кэше не сохраняется)
+        
+        :param full_name: Полное имя руководителя (ФИО)
+        :return: ИНН руководителя или None, если не удалось получить
+        """
+        inn = await self._memoized(
+            self._chairman_inn_cache, full_name,
+            lambda: self._get_chairman_inn_via_raiffeisen(full_name)
+        )
+        if inn is None:
+            fut = self._chairman_inn_cache.get(full_name)
+            if fut is not None and fut.done() and not fut.cancelled() and fut.result() is None:
+                del self._chairman_inn_cache[full_name]
+        return inn
+    
+    async def _prefetch_organizations(self, companies: List[CompanyData]) -> None:
+        """
+        Заранее запрашивает в API данные пачки компаний одним ключом.
+        Метод findById принимает только один ИНН, поэтому запросы пачки выполняются параллельно,
+        но через тот же семафор и ограничитель частоты, что и обычные запросы;
+        ошибки не обрабатываются здесь - такие компании запрашиваются повторно в parse_company
+        с полной обработкой ошибок и ротацией ключей.
+
+        :param companies: Компании пачки
+        """
+        if not self.token:
+            self.token = self._get_active_token()
+            if not self.token:
+                return
+
+        token = self.token
+        inns = [inn for inn in dict.fromkeys(company.inn for company in companies) if inn not in self._inn_cache]
+        await asyncio.gather(*(self._find_party_cached(token, inn) for inn in inns), return_exceptions=True)
+
     async def parse_companies(self, companies: List[CompanyData]) -> List[CompanyData]:
         """Парсит список компаний через API dadata.ru"""
         results = []
         self.logger.info(f"Начинаем обработку {len(companies)} компаний через API Dadata")
         
         # Сбрасываем счетчик неудачных попыток для ключей
-        self.failed_key_attempts = {}
-        
+        self.failed_key_attempts = Counter()
+        self._inn_cache = {}
+        self._chairman_inn_cache = {}
+        self._permanent_fail = set()
+
         try:
-            # Инициализация браузера с учетом операционной системы
-            if sys.platform == 'win32':
-                # Windows путь
-                chromedriver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
-                if not os.path.exists(chromedriver_path):
-                    chromedriver_path = 'C:/chromedriver/chromedriver.exe'
-                    if not os.path.exists(chromedriver_path):
-                        self.logger.error(f"ChromeDriver не найден по указанным путям Windows")
-                        return []
-            else:
-                # Linux/Mac путь
-                chromedriver_path = "./chromedriver"
-                if not os.path.exists(chromedriver_path):
-                    self.logger.error(f"ChromeDriver не найден по пути {chromedriver_path}")
-                    return []
-            
-            self.logger.info(f"Используется ChromeDriver по пути: {chromedriver_path}")
-            
-            # Создаем сервис и драйвер
-            service = Service(executable_path=chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=self.options)
-            self.driver.set_page_load_timeout(self.page_load_timeout)  # Таймаут загрузки страницы из конфигурации
-            self.wait = WebDriverWait(self.driver, self.element_wait_timeout)  # Таймаут для ожидания элементов из конфигурации
+            # Запуск пула браузеров (один раз, браузеры переиспользуются между вызовами)
+            if await self._get_pool() is None:
+                return []
             
             # Получаем ссылку на data_manager для обновления результатов
             data_manager = self._get_data_manager()
             
-            # Обработка всех компаний
-            for i, company in enumerate(companies):
-                try:
-                    # Проверяем на прерывание программы перед каждой компанией
-                    try:
-                        # Используем asyncio.sleep с очень маленьким таймаутом для проверки прерываний
-                        await asyncio.sleep(0.01)
-                    except asyncio.CancelledError:
-                        self.logger.info("Обнаружено прерывание, останавливаем парсинг")
-                        break
+            def finish(company: CompanyData, result: Optional[CompanyData]) -> None:
+                """Сохраняет результат обработки компании"""
+                if result:
+                    result.source = self.site_name
+                    results.append(result)
                     
-                    self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
-                    
-                    # Соблюдаем задержку между запросами
-                    await asyncio.sleep(self.rate_limit)
+                    # Проверяем, был ли достигнут лимит API
+                    if result.chairman_name == "лимит API исчерпан":
+                        self.logger.warning(f"Компания {company.name} помечена как 'лимит API исчерпан'")
+                    else:
+                        self.logger.info(f"Успешно получены данные для {company.name}")
                     
-                    # Парсим информацию о компании
-                    result = await self.parse_company(company)
-                    if result:
-                        result.source = self.site_name
-                        results.append(result)
-                        
-                        # Проверяем, был ли достигнут лимит API
-                        if result.chairman_name == "лимит API исчерпан":
-                            self.logger.warning(f"Компания {company.name} помечена как 'лимит API исчерпан'")
+                    # Обновляем результаты в data_manager если он доступен
+                    if data_manager:
+                        data_manager.update_results(result)
+                else:
+                    self.logger.warning(f"Не удалось получить данные для {company.name}")
+            
+            # Конвейер: данные компаний запрашиваются в API пачками заранее, затем обработчики этапа 1
+            # получают из ответов API руководителя (много одновременно), а компании, которым нужен
+            # поиск ИНН руководителя в браузере, передаются через очередь обработчикам этапа 2
+            # (одновременно - по числу браузеров пула). Медленный поиск в браузере не задерживает
+            # обработку ответов API для остальных компаний. None в очереди - завершение обработчика
+            api_queue: asyncio.Queue = asyncio.Queue()
+            browser_queue: asyncio.Queue = asyncio.Queue()
+            api_workers_count = self.concurrency
+            
+            async def producer() -> None:
+                """Запрашивает данные компаний пачками (с соблюдением частоты запросов) и передает их на этап 1"""
+                try:
+                    for start in range(0, len(companies), self.batch_size):
+                        batch = companies[start:start + self.batch_size]
+                        await self._rl.acquire()
+                        try:
+                            await self._prefetch_organizations(batch)
+                        except Exception as e:
+                            self.logger.error(f"Ошибка при пакетном запросе к API dadata.ru: {e}")
+                        for i, company in enumerate(batch, start):
+                            await api_queue.put((i, company))
+                finally:
+                    for _ in range(api_workers_count):
+                        api_queue.put_nowait(None)
+            
+            async def api_worker() -> None:
+                """Этап 1: получает руководителя компании через API"""
+                while True:
+                    item = await api_queue.get()
+                    if item is None:
+                        return
+                    i, company = item
+                    try:
+                        self.logger.info(f"[{i+1}/{len(companies)}] Обработка компании: {company.name} (ИНН: {company.inn})")
+                        needs_raiffeisen = await self._lookup_chairman(company)
+                        if needs_raiffeisen:
+                            await browser_queue.put(company)
                         else:
-                            self.logger.info(f"Успешно получены данные для {company.name}")
-                        
-                        self.logger.warning(f"Не удалось получить данные для {company.name}")
-                        
-                except Exception as e:
-                    self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
+                            finish(company, company if needs_raiffeisen is not None else None)
+                    except Exception as e:
+                        self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
+            
+            async def browser_worker() -> None:
+                """Этап 2: ищет ИНН руководителя на сайте Райффайзен банка"""
+                while True:
+                    company = await browser_queue.get()
+                    if company is None:
+                        return
+                    try:
+                        await self._resolve_chairman_inn(company)
+                        finish(company, company)
+                    except Exception as e:
+                        self.logger.error(f"Ошибка при обработке компании {company.name}: {e}")
+            
+            browser_tasks = [asyncio.create_task(browser_worker()) for _ in range(self._pool.size)]
+            try:
+                try:
+                    await asyncio.gather(producer(), *(api_worker() for _ in range(api_workers_count)))
+                finally:
+                    for _ in browser_tasks:
+                        browser_queue.put_nowait(None)
+                await asyncio.gather(*browser_tasks)
+            except asyncio.CancelledError:
+                self.logger.info("Обнаружено прерывание, останавливаем парсинг")
+                for task in browser_tasks:
+                    task.cancel()
             
             self.logger.info(f"Завершена обработка компаний через API Dadata, успешно: {len(results)} из {len(companies)}")
             
         except Exception as e:
             self.logger.error(f"Ошибка при инициализации API Dadata: {e}")
         finally:
-            # Закрываем клиент Dadata
-            if self.dadata:
-                try:
-                    await self.dadata.close()
-                except:
-                    pass
-            self.dadata = None
-            # Закрываем браузер только один раз после обработки всех компаний
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except Exception as e:
-                    self.logger.error(f"Ошибка при закрытии браузера: {e}")
-                self.driver = None
-                self.wait = None
+            # Закрываем общий HTTP-клиент
+            await self._close_http()
+            self._inn_cache = {}
+            self._chairman_inn_cache = {}
+            self._permanent_fail = set()
+            self._reset_raiffeisen_wait()
         
         return results
     
@@ -1612,27 +2320,58 @@ class DadataParser(BaseSiteParser):
         :param company: Объект с данными о компании
         :return: Обновленный объект с данными о компании или None в случае ошибки
         """
-        # Максимальное количество попыток с разными ключами
-        max_attempts = max(1, self.dadata_keys.get_all_keys_count())
+        needs_raiffeisen = await self._lookup_chairman(company)
+        if needs_raiffeisen is None:
+            return None
+        if needs_raiffeisen:
+            await self._resolve_chairman_inn(company)
+        return company
+    
+    async def _lookup_chairman(self, company: CompanyData) -> Optional[bool]:
+        """
+        Получает руководителя компании (и его ИНН, если он есть в ответе) через API dadata.ru
+        
+        :param company: Объект с данными о компании (заполняются chairman_name и, если найден, chairman_inn)
+        :return: True, если ИНН руководителя нужно искать на сайте Райффайзен банка,
+                 False, если данные компании получены полностью, None в случае ошибки
+        """
+        # Результат уже получен ранее (в этом или предыдущем запуске)
+        cached = self._get_cached_result(company.inn)
+        if cached is not None:
+            company.chairman_name, company.chairman_inn = cached
+            self.logger.info(f"Данные компании {company.inn} взяты из кэша")
+            return False
+        
+        # API уже отклонило этот ИНН в текущем запуске - не повторяем запросы
+        # (результат не сохраняется, в следующем запуске ИНН запрашивается снова)
+        if company.inn in self._permanent_fail:
+            return None
+        
+        # Максимальное количество попыток с разными ключами (исключенные после ошибок ключи не пробуются)
+        max_attempts = max(1, self.dadata_keys.get_available_keys_count())
         
         for attempt in range(max_attempts):
-            # Создаем клиент Dadata, если он еще не создан
-            if not self.dadata:
-                self.dadata = await self._create_dadata_client()
-                if not self.dadata:
-                    self.logger.error("Не удалось создать клиент Dadata")
+            # Выбираем ключ, если он еще не выбран
+            if not self.token:
+                self.token = self._get_active_token()
+                if not self.token:
+                    self.logger.error("Нет ключа для запросов к API Dadata")
                     return None
             
+            # Ключ, с которым выполняется запрос
+            used_key = self.token
+            
             try:
-                # Поиск компании по ИНН
-                organizations = await self.dadata.find_by_id(name="party", query=company.inn)
-                
+                # Поиск компании по ИНН (данные, полученные пачкой заранее или для дубликата ИНН, берутся из кэша)
+                organizations = await self._find_party_cached(used_key, company.inn)
+
                 if not organizations:
                     self.logger.warning(f"Компания {company.name} с ИНН {company.inn} не найдена в dadata.ru")
                     # Возвращаем данные с отметкой "не найдено"
                     company.chairman_name = "не найдено"
                     company.chairman_inn = "не найдено"
-                    return company
+                    self._cache_result(company)
+                    return False
                 
                 # Берем первую найденную организацию (обычно самую релевантную)
                 org_data = organizations[0]['data']
@@ -1649,284 +2388,315 @@ class DadataParser(BaseSiteParser):
                     
                     if org_data.get('managers') and len(org_data['managers']) > 0:
                         for manager in org_data['managers']:
-                            if manager.get('post') and ('председатель' in manager['post'].lower() or 'директор' in manager['post'].lower() or 'руководитель' in manager['post'].lower()):
+                            post = (manager.get('post') or '').lower()
+                            if post and any(title in post for title in _CHAIR_TITLES):
                                 if manager.get('inn'):
                                     chairman_inn = manager['inn']
                                     self.logger.info(f"Найден ИНН руководителя в Dadata: {chairman_inn}")
                                     break
                     
-                    # Если ИНН не найден в Dadata, пытаемся получить его через сайт Райффайзен банка
-                    if not chairman_inn:
-                        try:
-                            address = org_data.get('address').get("value")
-                            cur_city = address.split(",")[0]
-                        except Exception:
-                            pass
-                            
-                        try:
-                            chairman_inn = await self._get_chairman_inn_via_raiffeisen(chairman_name)
-                            
-                            if chairman_inn:
-                                self.logger.info(f"Получен ИНН руководителя через сайт Райффайзен: {chairman_inn}")
-                            else:
-                                self.logger.warning(f"Не удалось получить ИНН руководителя {chairman_name} через сайт Райффайзен")
-                                chairman_inn = "не найдено"
-                        except Exception as raiffeisen_error:
-                            self.logger.error(f"Ошибка при получении ИНН через Райффайзен: {raiffeisen_error}")
-                            # Гарантируем закрытие браузера при ошибке
-                            self._ensure_browser_closed()
-                            chairman_inn = "не найдено"
-                    
-                    company.chairman_inn = chairman_inn
+                    # Если ИНН не найден в Dadata, его нужно получить через сайт Райффайзен банка
+                    needs_raiffeisen = not chairman_inn
+                    if chairman_inn:
+                        company.chairman_inn = chairman_inn
                 else:
                     # Информация о руководителе не найдена
                     company.chairman_name = "не найдено"
                     company.chairman_inn = "не найдено"
+                    needs_raiffeisen = False
                     self.logger.warning(f"Данные о руководителе компании {company.name} не найдены в dadata.ru")
                 
                 # Сбрасываем счетчик неудачных попыток для текущего ключа, так как запрос успешен
-                current_key = self.dadata_keys.get_current_key()
-                if current_key in self.failed_key_attempts:
-                    del self.failed_key_attempts[current_key]
+                self.failed_key_attempts.pop(used_key, None)
+                self.dadata_keys.mark_succeeded(used_key)
                 
                 # Сбрасываем флаг игнорирования принудительного токена, так как запрос успешен
                 self.ignore_force_token_temporarily = False
                 
-                return company
+                # Результат, полученный только из API, сохраняем сразу; после поиска в браузере - если ИНН найден
+                if not needs_raiffeisen:
+                    self._cache_result(company)
+                return needs_raiffeisen
                 
             except Exception as e:
-                import httpx
-                
                 # Проверяем тип ошибки и обрабатываем его
                 if isinstance(e, httpx.HTTPStatusError):
-                    current_key = self.dadata_keys.get_current_key()
+                    current_key = used_key
                     
-                    # Проверяем, является ли ошибка ошибкой авторизации (403 Forbidden)
-                    if e.response.status_code == 403:
-                        self.logger.error(
-                            f"Ошибка при получении данных из API dadata.ru: ошибка авторизации (403 Forbidden). "
-                            f"Проверьте правильность API-ключа. Получите действительный токен на сайте https://dadata.ru/profile/#info"
-                        )
+                    # Счетчики неудач и ротация ключа изменяются под блокировкой,
+                    # чтобы параллельные запросы не переключали ключ повторно
+                    async with self._get_rot_lock():
+                        # Проверяем, является ли ошибка ошибкой авторизации (401 - ключ не передан
+                        # или неверен, 403 - доступ запрещен)
+                        if e.response.status_code in (401, 403):
+                            self.logger.error(
+                                f"Ошибка при получении данных из API dadata.ru: ошибка авторизации ({e.response.status_code}). "
+                                f"Проверьте правильность API-ключа. Получите действительный токен на сайте https://dadata.ru/profile/#info"
+                            )
                         
-                        # Отмечаем этот ключ как неудачный и пробуем следующий
-                        self.failed_key_attempts[current_key] = self.failed_key_attempts.get(current_key, 0) + 1
+                            # Отмечаем этот ключ как неудачный и пробуем следующий
+                            self.failed_key_attempts[current_key] += 1
                         
-                        # Если этот ключ уже несколько раз подряд не работал, переходим к следующему
-                        if self.failed_key_attempts.get(current_key, 0) >= self.max_key_attempts:
-                            self.logger.warning(f"Ключ многократно вызывал ошибку авторизации, пробуем другой ключ")
+                            # Если этот ключ уже несколько раз подряд не работал, переходим к следующему
+                            if self.failed_key_attempts[current_key] >= self.max_key_attempts:
+                                self.logger.warning(f"Ключ многократно вызывал ошибку авторизации, пробуем другой ключ")
+                                
+                                # Исключаем ключ из ротации для всех компаний
+                                self.dadata_keys.mark_failed(current_key, e.response.status_code)
                             
-                            # Если был установлен принудительный токен и он не работает, временно игнорируем его
-                            if self.force_token and current_key == self.force_token:
-                                self._temporarily_ignore_force_token()
-                            
-                            # Закрываем текущий клиент и пробуем создать новый с другим ключом
-                            if self.dadata:
-                                try:
-                                    await self.dadata.close()
-                                except:
-                                    pass
+                                # Если был установлен принудительный токен и он не работает, временно игнорируем его
+                                if self.force_token and current_key == self.force_token:
+                                    self._temporarily_ignore_force_token()
                             
-                            self.dadata = await self._rotate_dadata_client()
+                                # Переключаемся на другой ключ (соединения общего клиента сохраняются)
+                                self.token = self._switch_key(current_key)
                     
-                    # Если ошибка связана с превышением лимита запросов (429 Too Many Requests)
-                    elif e.response.status_code == 429:
-                        self.logger.warning(f"Превышен лимит запросов для API-ключа Dadata, переключаемся на другой ключ")
-                        
-                        # Если был установлен принудительный токен и он превысил лимит, временно игнорируем его
-                        if self.force_token and current_key == self.force_token:
-                            self._temporarily_ignore_force_token()
+                        # Если ошибка связана с превышением лимита запросов (429 Too Many Requests)
+                        elif e.response.status_code == 429:
+                            self.logger.warning(f"Превышен лимит запросов для API-ключа Dadata, переключаемся на другой ключ")
+                            
+                            # Исключаем ключ из ротации для всех компаний (на время из Retry-After)
+                            self.dadata_keys.mark_failed(
+                                current_key, 429, parse_retry_after(e.response.headers.get('Retry-After'))
+                            )
                         
-                        # Закрываем текущий клиент и пробуем создать новый с другим ключом
-                        if self.dadata:
-                            try:
-                                await self.dadata.close()
-                            except:
-                                pass
+                            # Если был установлен принудительный токен и он превысил лимит, временно игнорируем его
+                            if self.force_token and current_key == self.force_token:
+                                self._temporarily_ignore_force_token()
                         
-                        self.dadata = await self._rotate_dadata_client()
-                    else:
-                        self.logger.error(f"Ошибка HTTP при получении данных из API dadata.ru: {e}")
+                            # Переключаемся на другой ключ (соединения общего клиента сохраняются)
+                            self.token = self._switch_key(current_key)
+                        else:
+                            self.logger.error(f"Ошибка HTTP при получении данных из API dadata.ru: {e}")
+                    
+                    # Ошибка проверки запроса (не связанная с ключом) повторится с любым ключом -
+                    # запоминаем ИНН до конца текущего запуска и не тратим на него остальные попытки.
+                    # Результат не сохраняется как окончательный: в следующем запуске ИНН запрашивается снова
+                    if e.response.status_code in _DADATA_REJECTED_STATUSES:
+                        self._permanent_fail.add(company.inn)
+                        self.logger.warning(f"API dadata.ru отклонило запрос по ИНН {company.inn}, повторные попытки не выполняются")
+                        return None
                 else:
                     self.logger.error(f"Ошибка при получении данных из API dadata.ru: {e}")
                 
                 # Если мы перепробовали все ключи и попытки, возвращаем None
                 if attempt >= max_attempts - 1:
                     self.logger.error(f"Исчерпаны все попытки получения данных о компании {company.name}")
-                    # Убедимся, что браузер закрыт в случае ошибки
-                    self._ensure_browser_closed()
                     return None
         
-        # Убедимся, что браузер закрыт перед возвратом из функции
-        self._ensure_browser_closed()
         return None
     
+    async def _wait_raiffeisen_available(self) -> None:
+        """
+        Ожидает появления токена в ведре Райффайзен банка. Все ожидающие задачи ждут одно событие,
+        которое устанавливает один общий таймер, без периодических проверок
+        """
+        if self._raiffeisen_available is None:
+            self._raiffeisen_available = asyncio.Event()
+        if self._raiffeisen_timer is None:
+            self._raiffeisen_available.clear()
+            self._raiffeisen_timer = asyncio.get_running_loop().call_later(
+                raiffeisen_bucket.time_until_available(), self._set_raiffeisen_available
+            )
+        await self._raiffeisen_available.wait()
+    
+    def _set_raiffeisen_available(self) -> None:
+        """Будит задачи, ожидающие токен Райффайзен банка (вызывается таймером)"""
+        self._raiffeisen_timer = None
+        self._raiffeisen_available.set()
+    
+    def _reset_raiffeisen_wait(self) -> None:
+        """Отменяет таймер ожидания токена (событие привязано к циклу событий текущего запуска)"""
+        if self._raiffeisen_timer is not None:
+            self._raiffeisen_timer.cancel()
+        self._raiffeisen_timer = None
+        self._raiffeisen_available = None
+    
+    async def _resolve_chairman_inn(self, company: CompanyData) -> None:
+        """
+        Получает ИНН руководителя компании через сайт Райффайзен банка
+        
+        :param company: Объект с данными о компании (с заполненным chairman_name), заполняется chairman_inn
+        """
+        chairman_name = company.chairman_name
+        try:
+            chairman_inn = await self._get_chairman_inn_cached(chairman_name)
+            
+            if chairman_inn:
+                self.logger.info(f"Получен ИНН руководителя через сайт Райффайзен: {chairman_inn}")
+            else:
+                self.logger.warning(f"Не удалось получить ИНН руководителя {chairman_name} через сайт Райффайзен")
+                chairman_inn = "не найдено"
+        except Exception as raiffeisen_error:
+            self.logger.error(f"Ошибка при получении ИНН через Райффайзен: {raiffeisen_error}")
+            chairman_inn = "не найдено"
+        
+        company.chairman_inn = chairman_inn
+        # Неудачный поиск (в том числе из-за блокировки сайта) не кэшируем, чтобы повторить его в следующем запуске
+        if chairman_inn != "не найдено":
+            self._cache_result(company)
+    
     async def _get_chairman_inn_via_raiffeisen(self, full_name: str) -> Optional[str]:
         """
         Получает ИНН физического лица по ФИО через сайт Райффайзен банка
+        (в свободном браузере из пула)
         
         :param full_name: Полное имя руководителя (ФИО)
         :return: ИНН руководителя или None, если не удалось получить
         """
         self.logger.info(f"Поиск ИНН для {full_name} через сайт Райффайзен банка")
         
+        pool = await self._get_pool()
+        if pool is None:
+            return None
+        
         # Максимальное число попыток восстановления после бана
         max_retry_attempts = self.raiffeisen_max_retry_attempts
         current_retry = 0
         
-        while current_retry < max_retry_attempts:
-            try:
-                # Проверяем глобальный флаг блокировки перед каждой попыткой
-                if is_raiffeisen_blocked():
-                    self.logger.warning(f"Сайт Райфайзен банка заблокирован. Ожидаем перед повторной попыткой для {full_name}")
-                    # Ожидаем снятия блокировки
-                    await asyncio.sleep(RAIFFEISEN_SECONDARY_WAIT_SECONDS)
-                    # Проверяем снова
-                    if is_raiffeisen_blocked():
-                        self.logger.warning(f"Блокировка все еще активна. Попытка {current_retry}/{max_retry_attempts}")
-                        continue
-                
-                # Загрузка страницы
-                self.logger.info(f"Открываем сайт reg-raiffeisen.ru (Поиск для {full_name})")
-                self.driver.get("https://reg-raiffeisen.ru/")
-
-                # Если мы здесь, значит страница успешно загрузилась
-                if current_retry > 0:
-                    self.logger.info(f"Сайт снова доступен после {current_retry} попыток!")
-                
-                # Прокручиваем страницу вниз
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                
-                # Находим поле ввода для поиска ИП или ООО
-                try:
-                    # Попытка найти поле ввода по XPath
-                    xpath = "/html/body/div[1]/div[3]/div/div[2]/div[14]/div[2]/div/div/div/div/form/div[1]/div[1]/div/div/div[1]/div/div/div/div[1]/div[1]/input"
-                    input_field = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-                except Exception:
-                    # Если XPath не сработал, пробуем найти по ID или другим атрибутам
-                    self.logger.info("Поиск поля ввода по ID или атрибутам")
-                    try:
-                        input_field = self.wait.until(EC.presence_of_element_located((By.ID, "party")))
-                    except Exception:
-                        # Последняя попытка - найти по названию
-                        input_field = self.wait.until(EC.presence_of_element_located((By.NAME, "party")))
-                
-                # Прокручиваем страницу к полю ввода
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", input_field)
-                
-                # Делаем паузу перед вводом
-                await asyncio.sleep(2)
-                
-                # Очищаем поле ввода и вводим ФИО
-                input_field.clear()
-                input_field.send_keys(full_name)
-                
-                # Ждем появления выпадающего списка с подсказками
-                self.logger.info(f"Ожидаем результаты автоподсказки для {full_name}")
-                autocomplete_list = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "autocomplete-list")))
-                
-                # Ждем для полной загрузки списка
-                await asyncio.sleep(self.autocomplete_wait_seconds)
-                
-                # Находим все элементы списка
-                list_items = autocomplete_list.find_elements(By.TAG_NAME, "li")
-                
-                if not list_items:
-                    self.logger.warning(f"Автоподсказки для {full_name} не найдены")
-                    return None
-                
-                # Сначала пытаемся найти ИНН физического лица (12 цифр)
-                found_physical_inn = None
-                found_legal_inn = None
-                
-                # Первый проход - ищем только ИНН физических лиц (12 цифр)
-                for item in list_items:
-                    try:
-                        # Находим элемент с деталями (содержит ИНН)
-                        detail_element = item.find_element(By.CLASS_NAME, "ie_detail")
-                        detail_text = detail_element.text
-                        
-                        # Ищем ИНН физического лица (12 цифр)
-                        inn_match = re.search(r'(\d{12})', detail_text)
-                        
-                        if inn_match:
-                            found_physical_inn = inn_match.group(1)
-                            self.logger.info(f"Извлечен ИНН физического лица {found_physical_inn} для {full_name}")
-                            return found_physical_inn
-                    except Exception as item_e:
-                        self.logger.debug(f"Ошибка при обработке элемента списка: {item_e}")
-                        continue
-                
-                # Второй проход - ищем ИНН юридических лиц (10 цифр), если не нашли физлица
-                for item in list_items:
-                    try:
-                        detail_element = item.find_element(By.CLASS_NAME, "ie_detail")
-                        detail_text = detail_element.text
-                        
-                        # Ищем ИНН юридического лица (10 цифр)
-                        inn_match = re.search(r'(\d{10})', detail_text)
-                        
-                        if inn_match:
-                            found_legal_inn = inn_match.group(1)
-                            self.logger.info(f"Извлечен ИНН юридического лица {found_legal_inn} для {full_name}")
-                            return f"{found_legal_inn} (возможно юрлица)"
-                    except Exception:
-                        continue
-                
-                self.logger.warning(f"Не удалось извлечь ИНН из результатов поиска для {full_name}")
-                return None
-                
-            except Exception as e:
-                self.logger.error(f"Ошибка при парсинге сайта Райффайзен банка")
-                
-                # Устанавливаем глобальный флаг блокировки Райфайзен банка
-                set_raiffeisen_blocked()
-                self.logger.warning(f"Установлена глобальная блокировка Райфайзен банка. Ожидаем...")
-                
-                # Закрываем и пересоздаем драйвер перед уходом в сон
-                self._ensure_browser_closed()
-                
-                # Увеличиваем счетчик попыток
-                current_retry += 1
-                if current_retry >= max_retry_attempts:
-                    self.logger.error(f"Превышено максимальное количество попыток ({max_retry_attempts}) для {full_name}")
-                    return None
-                
-                # Пересоздаем драйвер после ошибки
+        item = await pool.acquire()
+        try:
+            while current_retry < max_retry_attempts:
                 try:
-                    # Создаем сервис и драйвер
-                    if sys.platform == 'win32':
-                        # Windows путь
-                        chromedriver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
-                        if not os.path.exists(chromedriver_path):
-                            chromedriver_path = 'C:/chromedriver/chromedriver.exe'
-                    else:
-                        # Linux/Mac путь
-                        chromedriver_path = "./chromedriver"
+                    # Проверяем глобальный флаг блокировки перед каждой попыткой
+                    if is_raiffeisen_blocked():
+                        self.logger.warning(f"Сайт Райфайзен банка заблокирован. Ожидаем перед повторной попыткой для {full_name}")
+                        # Ожидаем появления токена в ведре (токен мог забрать другой браузер - тогда ждем следующий)
+                        while is_raiffeisen_blocked():
+                            await self._wait_raiffeisen_available()
                     
-                    self.logger.info(f"Пересоздание драйвера, используется ChromeDriver по пути: {chromedriver_path}")
-                    service = Service(executable_path=chromedriver_path)
-                    self.driver = webdriver.Chrome(service=service, options=self.options)
-                    self.driver.set_page_load_timeout(self.page_load_timeout)
-                    self.wait = WebDriverWait(self.driver, self.element_wait_timeout)
-                except Exception as browser_error:
-                    self.logger.error(f"Не удалось создать браузер после ошибки: {browser_error}")
-                    return None
-                
-                # Продолжаем попытку с той же компанией
-                continue
-            
+                    driver, wait = item
+                    inn = await pool.run(self._search_inn_sync, full_name, driver, wait)
+                    
+                    if current_retry > 0:
+                        self.logger.info(f"Сайт снова доступен после {current_retry} попыток!")
+                    return inn
+                    
+                except Exception as e:
+                    self.logger.error(f"Ошибка при парсинге сайта Райффайзен банка")
+                    
+                    # Устанавливаем глобальный флаг блокировки Райфайзен банка
+                    set_raiffeisen_blocked()
+                    self.logger.warning(f"Установлена глобальная блокировка Райфайзен банка. Ожидаем...")
+                    
+                    # Увеличиваем счетчик попыток
+                    current_retry += 1
+                    if current_retry >= max_retry_attempts:
+                        self.logger.error(f"Превышено максимальное количество попыток ({max_retry_attempts}) для {full_name}")
+                        return None
+                    
+                    # Пересоздаем только этот браузер, остальные браузеры пула продолжают работу
+                    item = await pool.recreate(item)
+                    if item is None:
+                        # Браузер уже закрыт и удален из пула - возвращать в пул нечего
+                        return None
+                    
+                    # Продолжаем попытку с той же компанией
+                    continue
+        finally:
+            if item is not None:
+                pool.release(item)
         
         # Если исчерпали все попытки
         self.logger.error(f"Превышено максимальное количество попыток ({max_retry_attempts}) для {full_name}")
         return None
     
+    def _search_inn_sync(self, full_name: str, driver: webdriver.Chrome, wait: WebDriverWait) -> Optional[str]:
+        """
+        Синхронно ищет ИНН по ФИО на сайте Райффайзен банка в указанном браузере
+        (выполняется в пуле потоков браузеров; ошибки пробрасываются вызывающему коду)
+        
+        :param full_name: Полное имя руководителя (ФИО)
+        :param driver: Драйвер браузера из пула
+        :param wait: Объект ожидания для драйвера
+        :return: ИНН или None, если он не найден
+        """
+        # Загрузка страницы
+        self.logger.info(f"Открываем сайт reg-raiffeisen.ru (Поиск для {full_name})")
+        driver.get("https://reg-raiffeisen.ru/")
+
+        # Прокручиваем страницу вниз
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        
+        # Находим поле ввода для поиска ИП или ООО: сначала способом, сработавшим в прошлый раз,
+        # затем остальными по порядку (XPath, ID, название)
+        best_idx = self._input_locator_idx
+        order = [best_idx] + [idx for idx in range(len(_RAIFFEISEN_INPUT_LOCATORS)) if idx != best_idx]
+        for n, idx in enumerate(order):
+            try:
+                input_field = wait.until(EC.presence_of_element_located(_RAIFFEISEN_INPUT_LOCATORS[idx]))
+            except Exception:
+                if n == len(order) - 1:
+                    raise
+                self.logger.info("Поле ввода не найдено, пробуем другой способ поиска")
+                continue
+            self._input_locator_idx = idx
+            break
+        
+        # Прокручиваем страницу к полю ввода
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", input_field)
+        
+        # Очищаем поле ввода и вводим ФИО одной командой (вместо отдельного нажатия на каждый символ)
+        input_field.clear()
+        input_field.click()
+        driver.execute_cdp_cmd("Input.insertText", {"text": full_name})
+        
+        # Ждем появления выпадающего списка с подсказками
+        self.logger.info(f"Ожидаем результаты автоподсказки для {full_name}")
+        autocomplete_list = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "autocomplete-list")))
+        
+        # Ждем загрузки элементов списка (не дольше autocomplete_wait_seconds)
+        try:
+            WebDriverWait(driver, self.autocomplete_wait_seconds).until(
+                lambda d: d.execute_script("return arguments[0].querySelectorAll('li .ie_detail').length > 0;", autocomplete_list)
+            )
+        except TimeoutException:
+            pass
+        
+        # Получаем тексты деталей (содержат ИНН) всех элементов списка одним запросом к браузеру
+        detail_texts = driver.execute_script(
+            "return Array.from(arguments[0].querySelectorAll('li'), li => {"
+            "  const detail = li.querySelector('.ie_detail');"
+            "  return detail ? detail.textContent : '';"
+            "});",
+            autocomplete_list
+        )
+        
+        if not detail_texts:
+            self.logger.warning(f"Автоподсказки для {full_name} не найдены")
+            return None
+        
+        # Один проход: ИНН физического лица (12 цифр) возвращаем сразу, а первый ИНН
+        # юридического лица (10 цифр) запоминаем на случай, если ИНН физлица в списке нет
+        found_legal_inn = None
+        for detail_text in detail_texts:
+            inn_match = _INN12_RE.search(detail_text)
+            if inn_match:
+                found_physical_inn = inn_match.group(0)
+                self.logger.info(f"Извлечен ИНН физического лица {found_physical_inn} для {full_name}")
+                return found_physical_inn
+            if found_legal_inn is None:
+                inn_match = _INN10_RE.search(detail_text)
+                if inn_match:
+                    found_legal_inn = inn_match.group(0)
+        
+        if found_legal_inn is not None:
+            self.logger.info(f"Извлечен ИНН юридического лица {found_legal_inn} для {full_name}")
+            return f"{found_legal_inn} (возможно юрлица)"
+        
+        self.logger.warning(f"Не удалось извлечь ИНН из результатов поиска для {full_name}")
+        return None
+
     def _get_data_manager(self) -> Optional[DataManager]:
         """
-        Получает объект DataManager из текущего экземпляра BaseSiteParser
-        через поиск в родительских объектах
+        Возвращает менеджер данных, переданный ParserManager через set_data_manager.
+        Если парсер создан вне ParserManager, ищет его в вызывающих объектах по стеку вызовов
         
         :return: Экземпляр DataManager или None
         """
+        if self._data_manager is not None:
+            return self._data_manager
+        
         try:
             # Получаем доступ к родительскому объекту ParserManager
             frame = sys._getframe(2)
@@ -1940,19 +2710,10 @@ class DadataParser(BaseSiteParser):
             self.logger.debug(f"Не удалось получить доступ к data_manager: {e}")
         return None 
 
-    def _ensure_browser_closed(self) -> None:
-        """
-        Надежное закрытие браузера
-        """
-        if self.driver:
-            try:
-                self.logger.info("Закрываем браузер...")
-                # Закрываем браузер стандартным способом
-                self.driver.quit()
-                self.logger.info("Браузер успешно закрыт")
-            except Exception as e:
-                self.logger.error(f"Ошибка при закрытии браузера: {e}")
-            finally:
-                # Гарантируем, что ссылки на драйвер сбрасываются в любом случае
-                self.driver = None
-                self.wait = None
+    async def close(self) -> None:
+        """Закрывает браузеры пула, HTTP-клиент Dadata и HTTP-сессию"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        await self._close_http()
+        await super().close()